@@ -3,9 +3,9 @@
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-from models import B2BKontakt, EmailKontakt
+from models import B2BKontakt, EmailKontakt, url_hash_berechnen
 from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.db")
@@ -23,6 +23,17 @@ class Database:
         """Erstellt Datenbank und Tabellen falls nicht vorhanden."""
         self.conn = sqlite3.connect(str(self.db_pfad))
         self.conn.row_factory = sqlite3.Row
+        # Kein WAL: die DB wird als Einzeldatei (CI-Artifact) weitergereicht.
+        # synchronous=NORMAL spart fsyncs pro Commit; im schlimmsten Fall (Stromausfall)
+        # gehen die letzten Listings verloren und werden beim nächsten Lauf neu gefunden.
+        for pragma in (
+            "synchronous=NORMAL",
+            "temp_store=MEMORY",
+            "cache_size=-4096",
+            "mmap_size=67108864",
+            "busy_timeout=5000",
+        ):
+            self.conn.execute(f"PRAGMA {pragma}")
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS listings (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -102,8 +113,35 @@ class Database:
             CREATE INDEX IF NOT EXISTS idx_b2b_typ ON b2b_kontakte(typ)
         """)
         self.conn.commit()
+        self._url_hashes_migrieren()
         logger.info(f"Datenbank initialisiert: {self.db_pfad}")
 
+    def _url_hashes_migrieren(self):
+        """Einmalig: MD5-url_hashes (32 Zeichen) auf BLAKE2b-64 umstellen."""
+        if self.setting_lesen("url_hash_format") == "blake2b64":
+            return
+        self.conn.create_function("url_hash_neu", 1, url_hash_berechnen, deterministic=True)
+        with self.conn:
+            # Erst die Verweise (brauchen den alten Hash für den Join), dann die Listings
+            self.conn.execute("""
+                UPDATE email_kontakte SET listing_url_hash = (
+                    SELECT url_hash_neu(l.url) FROM listings l
+                    WHERE l.url_hash = email_kontakte.listing_url_hash
+                )
+                WHERE length(listing_url_hash) = 32 AND EXISTS (
+                    SELECT 1 FROM listings l WHERE l.url_hash = email_kontakte.listing_url_hash
+                )
+            """)
+            cursor = self.conn.execute(
+                "UPDATE listings SET url_hash = url_hash_neu(url) WHERE length(url_hash) = 32"
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO einstellungen (schluessel, wert) VALUES (?, ?)",
+                ("url_hash_format", "blake2b64"),
+            )
+        if cursor.rowcount > 0:
+            logger.info(f"url_hash migriert: {cursor.rowcount} Listings auf BLAKE2b-64")
+
     def existiert(self, url_hash: str) -> bool:
         """Prüft ob ein Listing bereits in der DB existiert."""
         cursor = self.conn.execute(
@@ -111,6 +149,20 @@ class Database:
         )
         return cursor.fetchone() is not None
 
+    def existierende_hashes(self, url_hashes: Iterable[str]) -> set[str]:
+        """Welche der url_hashes schon in der DB sind – eine Abfrage pro 900 Hashes."""
+        hashes = list(dict.fromkeys(url_hashes))
+        vorhanden = set()
+        # SQLite erlaubt (je nach Build) nur 999 Parameter pro Statement
+        for i in range(0, len(hashes), 900):
+            teil = hashes[i:i + 900]
+            cursor = self.conn.execute(
+                f"SELECT url_hash FROM listings WHERE url_hash IN ({','.join('?' * len(teil))})",
+                teil,
+            )
+            vorhanden.update(row[0] for row in cursor)
+        return vorhanden
+
     def speichern(
         self,
         url_hash: str,
@@ -144,6 +196,27 @@ class Database:
         logger.info(f"Neues Listing gespeichert: {titel[:50]} (Score: {score})")
         return True
 
+    def speichern_bulk(self, zeilen: list[dict]) -> int:
+        """Speichert viele Listings in einer Transaktion (Keys wie bei speichern).
+
+        Bereits bekannte url_hashes werden übersprungen. Gibt die Anzahl neu eingefügter zurück.
+        """
+        if not zeilen:
+            return 0
+        vorher = self.conn.total_changes
+        with self.conn:
+            self.conn.executemany(
+                """INSERT OR IGNORE INTO listings
+                   (url_hash, url, titel, beschreibung, ort, quelle,
+                    kategorie, score, prioritaet, status, antwort_vorschlag)
+                   VALUES (:url_hash, :url, :titel, :beschreibung, :ort, :quelle,
+                           :kategorie, :score, :prioritaet, :status, :antwort_vorschlag)""",
+                [{"status": "neu", "antwort_vorschlag": "", **zeile} for zeile in zeilen],
+            )
+        neu = self.conn.total_changes - vorher
+        logger.info(f"{neu} neue Listings gespeichert ({len(zeilen) - neu} bereits bekannt)")
+        return neu
+
     def status_aktualisieren(self, url_hash: str, neuer_status: str):
         """Aktualisiert den Status eines Listings."""
         self.conn.execute(
@@ -8,92 +8,113 @@ from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.criteria")
 
+_RE_FLAECHE = re.compile(r"\d+\s*m[²2]|\d+\s*qm|\d+\s*quadrat", re.I)
+_RE_RAUM = re.compile(r"\d+\s*zimmer|\d+\s*räume|\d+\s*raum", re.I)
+
+
+def _alternation(woerter) -> Optional[re.Pattern]:
+    """Eine Regex für "enthält eines der Wörter" – ein Scan statt einem pro Wort."""
+    woerter = [w for w in woerter if w]
+    if not woerter:
+        return None
+    return re.compile("|".join(re.escape(w) for w in woerter))
+
+
+_RE_GEWERBLICH = _alternation([
+    "firma", "gmbh", "ag ", "gbr", "unternehmen",
+    "gewerbe", "gewerblich", "großauftrag", "serie",
+])
+_RE_DRINGEND = _alternation([
+    "dringend", "schnell", "asap", "sofort", "diese woche",
+    "kurzfristig", "eilig", "notfall", "baldmöglichst",
+    "zeitnah", "nächste woche",
+])
+
+# Ort-Plausibilität: Ort ohne BW-Bezug, aber mit bekannter Großstadt außerhalb → Ausschluss
+_RE_BW_INDIKATOREN = _alternation([
+    "heilbronn", "stuttgart", "ludwigsburg", "mannheim",
+    "heidelberg", "karlsruhe", "freiburg", "ulm", "tübingen",
+    "reutlingen", "esslingen", "pforzheim", "baden",
+    "württemberg", "sachsenheim", "neckarsulm", "weinsberg",
+])
+_RE_NICHT_BW = _alternation([
+    "berlin", "hamburg", "münchen", "köln", "frankfurt",
+    "düsseldorf", "dortmund", "essen", "bremen", "dresden",
+    "leipzig", "hannover", "nürnberg",
+])
+
 
 class Criteria:
+    """Textprüfungen; text = vorab kleingeschriebenes "titel beschreibung" (optional)."""
+
     def __init__(self, config: dict):
         self.config = config
         ausschluesse = config.get("ausschluesse", {})
         self._ausschluss_leistungen = [s.lower() for s in ausschluesse.get("leistungen", [])]
         self._ausschluss_billig = [s.lower() for s in ausschluesse.get("begriffe_billig", [])]
-        self._suchbegriffe = config.get("suchbegriffe", {})
+        suchbegriffe = config.get("suchbegriffe", {})
+        # Reihenfolge = Vorrang bei Gleichstand
+        self._kategorie_keywords = tuple(
+            (kategorie, tuple(kw.lower() for kw in suchbegriffe.get(key, [])))
+            for kategorie, key in (
+                (Kategorie.BODEN, "boden"),
+                (Kategorie.MONTAGE, "montage"),
+                (Kategorie.UEBERGABE, "uebergabe"),
+            )
+        )
+        self._re_ausschluss = _alternation(self._ausschluss_leistungen + self._ausschluss_billig)
 
-    def ist_ausgeschlossen(self, listing: Listing) -> tuple[bool, Optional[str]]:
-        text = f"{listing.titel} {listing.beschreibung}".lower()
+    def ist_ausgeschlossen(self, listing: Listing, text: Optional[str] = None) -> tuple[bool, Optional[str]]:
+        if text is None:
+            text = f"{listing.titel} {listing.beschreibung}".lower()
+        # Vorprüfung in einem Scan; welcher Begriff greift, nur bei Treffer ermitteln
+        if self._re_ausschluss is not None and self._re_ausschluss.search(text):
+            return self._ausschluss_grund(text)
+        return self._ist_ausserhalb_bw(listing)
+
+    def _ausschluss_grund(self, text: str) -> tuple[bool, Optional[str]]:
         for ausschluss in self._ausschluss_leistungen:
             if ausschluss in text:
                 return True, f"Ausgeschlossene Leistung: {ausschluss}"
         for billig in self._ausschluss_billig:
             if billig in text:
                 return True, f"Billig-Anfrage: {billig}"
-        bw_indikatoren = [
-            "heilbronn", "stuttgart", "ludwigsburg", "mannheim",
-            "heidelberg", "karlsruhe", "freiburg", "ulm", "tübingen",
-            "reutlingen", "esslingen", "pforzheim", "baden",
-            "württemberg", "sachsenheim", "neckarsulm", "weinsberg",
-        ]
+        return False, None
+
+    def _ist_ausserhalb_bw(self, listing: Listing) -> tuple[bool, Optional[str]]:
         ort_lower = listing.ort.lower()
-        if ort_lower and not any(ind in ort_lower for ind in bw_indikatoren):
-            nicht_bw = [
-                "berlin", "hamburg", "münchen", "köln", "frankfurt",
-                "düsseldorf", "dortmund", "essen", "bremen", "dresden",
-                "leipzig", "hannover", "nürnberg",
-            ]
-            for stadt in nicht_bw:
-                if stadt in ort_lower:
-                    return True, f"Region außerhalb BW: {listing.ort}"
+        if (
+            ort_lower
+            and not _RE_BW_INDIKATOREN.search(ort_lower)
+            and _RE_NICHT_BW.search(ort_lower)
+        ):
+            return True, f"Region außerhalb BW: {listing.ort}"
         return False, None
 
-    def kategorie_erkennen(self, listing: Listing) -> Kategorie:
-        text = f"{listing.titel} {listing.beschreibung}".lower()
-        boden_score = self._keyword_match_count(text, "boden")
-        montage_score = self._keyword_match_count(text, "montage")
-        uebergabe_score = self._keyword_match_count(text, "uebergabe")
-        scores = {
-            Kategorie.BODEN: boden_score,
-            Kategorie.MONTAGE: montage_score,
-            Kategorie.UEBERGABE: uebergabe_score,
-        }
-        best = max(scores, key=scores.get)
-        if scores[best] > 0:
-            return best
-        return Kategorie.SONSTIGES
-
-    def _keyword_match_count(self, text: str, kategorie_key: str) -> int:
-        keywords = self._suchbegriffe.get(kategorie_key, [])
-        count = 0
-        for kw in keywords:
-            if kw.lower() in text:
-                count += 1
-        return count
-
-    def ist_privatkunde(self, listing: Listing) -> bool:
-        text = f"{listing.titel} {listing.beschreibung}".lower()
-        gewerblich_indikatoren = [
-            "firma", "gmbh", "ag ", "gbr", "unternehmen",
-            "gewerbe", "gewerblich", "großauftrag", "serie",
-        ]
-        for ind in gewerblich_indikatoren:
-            if ind in text:
-                return False
-        return True
-
-    def hat_dringlichkeit(self, listing: Listing) -> bool:
-        text = f"{listing.titel} {listing.beschreibung}".lower()
-        dringend_keywords = [
-            "dringend", "schnell", "asap", "sofort", "diese woche",
-            "kurzfristig", "eilig", "notfall", "baldmöglichst",
-            "zeitnah", "nächste woche",
-        ]
-        return any(kw in text for kw in dringend_keywords)
+    def kategorie_erkennen(self, listing: Listing, text: Optional[str] = None) -> Kategorie:
+        if text is None:
+            text = f"{listing.titel} {listing.beschreibung}".lower()
+        best, best_score = Kategorie.SONSTIGES, 0
+        for kategorie, keywords in self._kategorie_keywords:
+            score = sum(kw in text for kw in keywords)
+            if score > best_score:
+                best, best_score = kategorie, score
+        return best
+
+    def ist_privatkunde(self, listing: Listing, text: Optional[str] = None) -> bool:
+        if text is None:
+            text = f"{listing.titel} {listing.beschreibung}".lower()
+        return not _RE_GEWERBLICH.search(text)
+
+    def hat_dringlichkeit(self, listing: Listing, text: Optional[str] = None) -> bool:
+        if text is None:
+            text = f"{listing.titel} {listing.beschreibung}".lower()
+        return _RE_DRINGEND.search(text) is not None
 
     def hat_realistische_beschreibung(self, listing: Listing) -> bool:
         text = listing.beschreibung
         if len(text) < 20:
             return False
-        flaeche_pattern = r"\d+\s*m[²2]|\d+\s*qm|\d+\s*quadrat"
-        raum_pattern = r"\d+\s*zimmer|\d+\s*räume|\d+\s*raum"
-        if re.search(flaeche_pattern, text.lower()):
-            return True
-        if re.search(raum_pattern, text.lower()):
+        if _RE_FLAECHE.search(text) or _RE_RAUM.search(text):
             return True
         return len(text) >= 50
@@ -1,11 +1,17 @@
 """Scoring-Engine: Bewertet Listings auf Relevanz (0-100)."""
 
+import hashlib
+from collections import OrderedDict
+
 from models import Listing, Kategorie, Prioritaet, Bewertungsergebnis
 from filter.criteria import Criteria
 from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.scorer")
 
+# Max. Einträge im Ergebnis-Cache (LRU)
+CACHE_MAX = 10_000
+
 
 class Scorer:
     def __init__(self, config: dict):
@@ -14,11 +20,49 @@ class Scorer:
         self.scoring_config = config.get("scoring", {})
         self.gewichtung = self.scoring_config.get("gewichtung", {})
         self.regionen = config.get("regionen", {})
+        # (score, keywords klein, plz_prefixes) je Region, in Config-Reihenfolge
+        self._regionen = tuple(
+            (
+                region_data.get("score", 0),
+                tuple(kw.lower() for kw in region_data.get("keywords", [])),
+                tuple(region_data.get("plz_prefixes", [])),
+            )
+            for region_data in self.regionen.values()
+        )
+        # Gleicher Inhalt auf mehreren Plattformen → Scores nur einmal berechnen.
+        # Schlüssel: Hash über titel/beschreibung/ort, Wert: Felder ohne Listing
+        self._cache: OrderedDict[bytes, tuple] = OrderedDict()
 
     def bewerten(self, listing: Listing) -> Bewertungsergebnis:
-        ausgeschlossen, grund = self.criteria.ist_ausgeschlossen(listing)
+        schluessel = hashlib.blake2b(
+            f"{listing.titel}\0{listing.beschreibung}\0{listing.ort}".encode(),
+            digest_size=12,
+        ).digest()
+        felder = self._cache.get(schluessel)
+        if felder is not None:
+            self._cache.move_to_end(schluessel)
+            return Bewertungsergebnis(listing, *felder)
+
+        ergebnis = self._berechnen(listing)
+        self._cache[schluessel] = (
+            ergebnis.score_gesamt,
+            ergebnis.score_region,
+            ergebnis.score_leistung,
+            ergebnis.score_qualitaet,
+            ergebnis.kategorie,
+            ergebnis.prioritaet,
+            ergebnis.ausgeschlossen,
+            ergebnis.ausschluss_grund,
+        )
+        if len(self._cache) > CACHE_MAX:
+            self._cache.popitem(last=False)
+        return ergebnis
+
+    def _berechnen(self, listing: Listing) -> Bewertungsergebnis:
+        text = f"{listing.titel} {listing.beschreibung}".lower()
+        ausgeschlossen, grund = self.criteria.ist_ausgeschlossen(listing, text)
         if ausgeschlossen:
-            logger.debug(f"Ausgeschlossen: {listing.titel[:50]} → {grund}")
+            logger.debug("Ausgeschlossen: %s → %s", listing.titel[:50], grund)
             return Bewertungsergebnis(
                 listing=listing,
                 score_gesamt=0,
@@ -30,10 +74,10 @@ class Scorer:
                 ausgeschlossen=True,
                 ausschluss_grund=grund,
             )
-        kategorie = self.criteria.kategorie_erkennen(listing)
+        kategorie = self.criteria.kategorie_erkennen(listing, text)
         score_region = self._score_region(listing)
-        score_leistung = self._score_leistung(listing, kategorie)
-        score_qualitaet = self._score_qualitaet(listing)
+        score_leistung = self._score_leistung(kategorie, text)
+        score_qualitaet = self._score_qualitaet(listing, text)
         score_gesamt = score_region + score_leistung + score_qualitaet
         gruen_min = self.scoring_config.get("gruen_min", 70)
         gelb_min = self.scoring_config.get("gelb_min", 40)
@@ -52,10 +96,10 @@ class Scorer:
             kategorie=kategorie,
             prioritaet=prioritaet,
         )
-        logger.info(
-            f"Score: {score_gesamt}/100 [{prioritaet.value}] "
-            f"({score_region}R + {score_leistung}L + {score_qualitaet}Q) "
-            f"→ {listing.titel[:50]}"
+        logger.debug(
+            "Score: %d/100 [%s] (%dR + %dL + %dQ) → %s",
+            score_gesamt, prioritaet.value, score_region, score_leistung, score_qualitaet,
+            listing.titel[:50],
         )
         return ergebnis
 
@@ -64,18 +108,12 @@ class Scorer:
         ort = listing.ort.lower()
         if not ort:
             return max_punkte // 3
-        for region_name, region_data in self.regionen.items():
-            region_score = region_data.get("score", 0)
-            keywords = [kw.lower() for kw in region_data.get("keywords", [])]
-            plz_prefixes = region_data.get("plz_prefixes", [])
-            if any(kw in ort for kw in keywords):
+        for region_score, keywords, plz_prefixes in self._regionen:
+            if any(kw in ort for kw in keywords) or any(p in ort for p in plz_prefixes):
                 return region_score
-            for prefix in plz_prefixes:
-                if prefix in ort:
-                    return region_score
         return 5
 
-    def _score_leistung(self, listing: Listing, kategorie: Kategorie) -> int:
+    def _score_leistung(self, kategorie: Kategorie, text: str) -> int:
         max_punkte = self.gewichtung.get("leistung", 40)
         leistung_scores = {
             Kategorie.BODEN: max_punkte,
@@ -84,7 +122,6 @@ class Scorer:
             Kategorie.SONSTIGES: int(max_punkte * 0.375),
         }
         base_score = leistung_scores.get(kategorie, 15)
-        text = f"{listing.titel} {listing.beschreibung}".lower()
         fitness_keywords = [
             "homegym", "power rack", "squat rack", "fitnessgerät",
             "kraftstation", "hantelbank", "laufband",
@@ -95,12 +132,12 @@ class Scorer:
             base_score = min(max_punkte, base_score + 3)
         return base_score
 
-    def _score_qualitaet(self, listing: Listing) -> int:
+    def _score_qualitaet(self, listing: Listing, text: str) -> int:
         score = 0
-        if self.criteria.ist_privatkunde(listing):
+        if self.criteria.ist_privatkunde(listing, text):
             score += 10
         if self.criteria.hat_realistische_beschreibung(listing):
             score += 10
-        if self.criteria.hat_dringlichkeit(listing):
+        if self.criteria.hat_dringlichkeit(listing, text):
             score += 10
         return score
@@ -4,6 +4,7 @@ import json
 import re
 import shutil
 import subprocess
+import threading
 import time
 from datetime import date
 from typing import Optional
@@ -92,6 +93,8 @@ class KIClient:
         self._anfrage_timestamps: list[float] = []
         self._token_verbrauch: dict[str, dict[str, int]] = {}
         self._tracking_datum: date = date.today()
+        # anfrage() darf aus mehreren Threads kommen (parallele Outreach-Nachrichten)
+        self._lock = threading.Lock()
 
     @property
     def ist_verfuegbar(self) -> bool:
@@ -114,13 +117,14 @@ class KIClient:
         if not modell:
             modell = self.ki_config.get("modell", self.MODELL_SCHNELL)
 
-        self._rate_limit_warten()
+        with self._lock:
+            self._rate_limit_warten()
 
-        # Tages-Tracking zurücksetzen
-        heute = date.today()
-        if heute != self._tracking_datum:
-            self._token_verbrauch = {}
-            self._tracking_datum = heute
+            # Tages-Tracking zurücksetzen
+            heute = date.today()
+            if heute != self._tracking_datum:
+                self._token_verbrauch = {}
+                self._tracking_datum = heute
 
         # System-Prompt als XML-Tags im Prompt einbetten
         # (vermeidet --append-system-prompt welches Claude Code's eigenen Kontext erweitert)
@@ -160,7 +164,8 @@ class KIClient:
             # Token-Schätzung: ~4 Zeichen = 1 Token
             prompt_tokens = len(vollstaendiger_prompt) // 4
             completion_tokens = len(antwort) // 4
-            self._token_tracking(agent_name, prompt_tokens, completion_tokens)
+            with self._lock:
+                self._token_tracking(agent_name, prompt_tokens, completion_tokens)
 
             logger.debug(f"claude CLI OK ({agent_name}): {len(antwort)} Zeichen")
             return antwort
@@ -201,4 +206,5 @@ class KIClient:
         self._token_verbrauch[agent_name]["anfragen"] += 1
 
     def token_verbrauch_heute(self) -> dict:
-        return dict(self._token_verbrauch)
+        with self._lock:
+            return dict(self._token_verbrauch)
@@ -13,14 +13,21 @@ Nutzung:
 import argparse
 import signal
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 import schedule
 import yaml
 from dotenv import load_dotenv
 
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml, deutlich schneller
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 # Projektroot zu sys.path hinzufügen
 ROOT = Path(__file__).resolve().parent
 sys.path.insert(0, str(ROOT))
@@ -40,7 +47,7 @@ from scrapers.google_search import GoogleScraper
 from scrapers.facebook import FacebookScraper
 from scrapers.nebenan import NebenanScraper
 from scrapers.markt import MarktScraper
-from utils.date_parser import ist_nicht_aelter_als_stunden
+from utils.date_parser import alter_pruefer
 from utils.logger import setup_logger
 from utils.standort_filter import ist_im_einzugsgebiet
 
@@ -61,7 +68,13 @@ class AkquiseAgent:
         self.telegram = TelegramNotifier(self.config)
         self.response_gen = ResponseGenerator(self.config)
         self.scrapers = self._init_scrapers()
-        self._running = True
+        self._stop = threading.Event()
+        # Aus der Config abgeleitet; _strategie_anwenden setzt sie bei Änderungen zurück
+        self._suchbegriffe: Optional[list[str]] = None
+        self._regionen: Optional[list[str]] = None
+        # Backoff des Scan-Intervalls bei aufeinanderfolgenden leeren Durchläufen
+        self._leere_durchlaeufe = 0
+        self._durchlauf_job_ref: Optional[schedule.Job] = None
 
         # KI-Agenten initialisieren
         self.ki_enabled = self.config.get("ki", {}).get("enabled", False)
@@ -70,7 +83,7 @@ class AkquiseAgent:
             self.strategie_agent = StrategieAgent(self.ki_client, self.config)
             self.such_agent = SuchAgent(self.ki_client, self.config)
             self.outreach_agent = OutreachAgent(self.ki_client, self.config)
-            logger.info(f"KI-Agenten aktiviert (Client verfügbar: {self.ki_client.ist_verfuegbar})")
+            logger.info("KI-Agenten aktiviert (Client verfügbar: %s)", self.ki_client.ist_verfuegbar)
         else:
             self.ki_client = None
             self.strategie_agent = None
@@ -119,72 +132,87 @@ class AkquiseAgent:
 
         logger.info("=" * 50)
         logger.info("SE Handwerk Akquise-Agent gestartet")
-        logger.info(f"Aktive Scraper: {[s.name for s in self.scrapers]}")
-        logger.info(f"KI-Agenten: {'aktiviert' if self.ki_enabled else 'deaktiviert'}")
+        logger.info("Aktive Scraper: %s", [s.name for s in self.scrapers])
+        logger.info("KI-Agenten: %s", 'aktiviert' if self.ki_enabled else 'deaktiviert')
         logger.info("=" * 50)
 
     def _load_config(self, pfad: str) -> dict:
         """Lädt die Konfiguration aus config.yaml."""
         config_path = ROOT / pfad
         if not config_path.exists():
-            logger.error(f"Config nicht gefunden: {config_path}")
+            logger.error("Config nicht gefunden: %s", config_path)
             sys.exit(1)
 
         with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
 
-        logger.info(f"Config geladen: {config_path}")
+        logger.info("Config geladen: %s", config_path)
         return config
 
     def _init_scrapers(self) -> list:
         """Initialisiert alle aktivierten Scraper."""
+        # (Config-Abschnitt, Klasse, enabled-Standard)
+        registry = [
+            ("kleinanzeigen", KleinanzeigenScraper, True),
+            ("myhammer", MyHammerScraper, True),
+            ("google", GoogleScraper, True),
+            ("facebook", FacebookScraper, False),
+            ("nebenan", NebenanScraper, False),
+            ("markt", MarktScraper, False),
+        ]
         scrapers = []
-
-        if self.config.get("kleinanzeigen", {}).get("enabled", True):
-            scrapers.append(KleinanzeigenScraper(self.config))
-
-        if self.config.get("myhammer", {}).get("enabled", True):
-            scrapers.append(MyHammerScraper(self.config))
-
-        if self.config.get("google", {}).get("enabled", True):
-            scrapers.append(GoogleScraper(self.config))
-
-        if self.config.get("facebook", {}).get("enabled", False):
-            scrapers.append(FacebookScraper(self.config))
-
-        if self.config.get("nebenan", {}).get("enabled", False):
-            scrapers.append(NebenanScraper(self.config))
-
-        if self.config.get("markt", {}).get("enabled", False):
-            scrapers.append(MarktScraper(self.config))
-
+        for abschnitt, klasse, standard in registry:
+            if not self.config.get(abschnitt, {}).get("enabled", standard):
+                continue
+            # Platzhalter (suchen() liefert immer []) gar nicht erst instanziieren
+            if not klasse.implementiert:
+                logger.info("Scraper '%s' ist ein Platzhalter – übersprungen", abschnitt)
+                continue
+            scrapers.append(klasse(self.config))
         return scrapers
 
     def _get_suchbegriffe(self) -> list[str]:
-        """Sammelt alle Suchbegriffe aus der Config."""
-        alle = []
-        for kategorie, begriffe in self.config.get("suchbegriffe", {}).items():
-            alle.extend(begriffe)
-        return alle
+        """Sammelt alle Suchbegriffe aus der Config (gecacht)."""
+        if self._suchbegriffe is None:
+            alle = []
+            for kategorie, begriffe in self.config.get("suchbegriffe", {}).items():
+                alle.extend(begriffe)
+            self._suchbegriffe = alle
+        return self._suchbegriffe
 
     def _get_regionen(self) -> list[str]:
-        """Suchgebiet: nur Heilbronn mit 100 km Radius (wenn aktiv)."""
+        """Suchgebiet: nur Heilbronn mit 100 km Radius (wenn aktiv). Gecacht."""
+        if self._regionen is not None:
+            return self._regionen
         suchgebiet = self.config.get("suchgebiet", {})
         if suchgebiet.get("aktiv"):
             zentrum = suchgebiet.get("zentrum", "Heilbronn")
-            logger.info(f"Suchgebiet: nur {zentrum} (Radius {suchgebiet.get('radius_km', 100)} km)")
-            return [zentrum]
+            logger.info("Suchgebiet: nur %s (Radius %s km)", zentrum, suchgebiet.get('radius_km', 100))
+            self._regionen = [zentrum]
+            return self._regionen
         regionen = []
         for region_data in self.config.get("regionen", {}).values():
             keywords = region_data.get("keywords", [])
             if keywords:
                 regionen.append(keywords[0])
+        self._regionen = regionen
         return regionen
 
-    def durchlauf(self):
-        """Führt einen kompletten Scan-Durchlauf durch."""
+    def _nachrichten_erstellen(self, ergebnisse: list[Bewertungsergebnis]) -> list[str]:
+        """Antwortvorschläge für relevante Leads; KI-Aufrufe laufen parallel."""
+        if not (self.ki_enabled and self.outreach_agent):
+            return [self.response_gen.generieren(e) for e in ergebnisse]
+        # Jeder Aufruf ist ein claude-Subprozess; das Rate-Limit hält KIClient selbst ein
+        max_parallel = self.config.get("ki", {}).get("outreach", {}).get("max_parallel", 4)
+        if len(ergebnisse) <= 1 or max_parallel <= 1:
+            return [self.outreach_agent.nachricht_erstellen(e) for e in ergebnisse]
+        with ThreadPoolExecutor(max_workers=min(max_parallel, len(ergebnisse))) as executor:
+            return list(executor.map(self.outreach_agent.nachricht_erstellen, ergebnisse))
+
+    def durchlauf(self) -> int:
+        """Führt einen kompletten Scan-Durchlauf durch und gibt die Zahl neuer Ergebnisse zurück."""
         logger.info("-" * 40)
-        logger.info(f"Starte Durchlauf: {datetime.now().strftime('%H:%M:%S')}")
+        logger.info("Starte Durchlauf: %s", datetime.now().strftime('%H:%M:%S'))
 
         # B2B: genehmigte E-Mails senden + Follow-ups prüfen
         if self.b2b_manager:
@@ -192,14 +220,14 @@ class AkquiseAgent:
                 self.b2b_manager.genehmigte_senden()
                 self.b2b_manager.follow_ups_pruefen()
             except Exception as e:
-                logger.error(f"Fehler bei B2B-Manager: {e}")
+                logger.error("Fehler bei B2B-Manager: %s", e)
 
         # Genehmigte E-Mails senden + Telegram-Callbacks verarbeiten
         if self.outreach_manager:
             try:
                 self.outreach_manager.genehmigte_senden()
             except Exception as e:
-                logger.error(f"Fehler bei genehmigte_senden: {e}")
+                logger.error("Fehler bei genehmigte_senden: %s", e)
 
         # 1. StrategieAgent (1x täglich)
         if self.ki_enabled and self.strategie_agent and self.strategie_agent.soll_ausfuehren():
@@ -213,9 +241,9 @@ class AkquiseAgent:
                     if auto_anwenden:
                         # Self-Improvement: Neue Suchbegriffe direkt anwenden
                         self._strategie_anwenden(plan)
-                        logger.info(f"Strategie angewendet: {len(plan.neue_suchbegriffe)} neue Begriffe")
+                        logger.info("Strategie angewendet: %d neue Begriffe", len(plan.neue_suchbegriffe))
             except Exception as e:
-                logger.error(f"Fehler bei Strategie-Agent: {e}")
+                logger.error("Fehler bei Strategie-Agent: %s", e)
 
         # 2. Scraper holen Listings (wie bisher)
         suchbegriffe = self._get_suchbegriffe()
@@ -223,122 +251,157 @@ class AkquiseAgent:
         neue_ergebnisse = 0
         fehler = 0
 
-        for scraper in self.scrapers:
-            try:
-                logger.info(f"→ Scraper: {scraper.name}")
-
-                relevante_begriffe = suchbegriffe[:8]
-                relevante_regionen = regionen[:3]
-
-                listings = scraper.alle_suchen(relevante_begriffe, relevante_regionen)
+        relevante_begriffe = suchbegriffe[:8]
+        relevante_regionen = regionen[:3]
 
-                # Standort-Filter: Nur Listings im Einzugsgebiet
-                vorher = len(listings)
-                listings = [l for l in listings if ist_im_einzugsgebiet(l, self.config)[0]]
-                if vorher > len(listings):
-                    logger.info(
-                        f"Standort-Filter: {vorher - len(listings)} Anzeigen "
-                        f"außerhalb Einzugsgebiet entfernt, {len(listings)} übrig"
+        # Quellen parallel abrufen (ein Thread pro Scraper; innerhalb einer Quelle
+        # bleiben die Requests mit Pausen sequenziell). DB, Scoring und Telegram
+        # laufen weiter im Hauptthread – die SQLite-Verbindung ist nicht thread-safe.
+        max_parallel = self.config.get("scraper", {}).get("max_parallel", 4)
+        for scraper in self.scrapers:
+            scraper.neuer_durchlauf()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(self.scrapers)))) as executor:
+            abrufe = [
+                (scraper, executor.submit(scraper.alle_suchen, relevante_begriffe, relevante_regionen))
+                for scraper in self.scrapers
+            ]
+            for scraper, abruf in abrufe:
+                try:
+                    logger.info("→ Scraper: %s", scraper.name)
+                    listings = abruf.result()
+
+                    # Standort- und Alter-Filter (nicht älter als X Stunden, z. B. 5) in einem Durchgang
+                    max_alter = (
+                        self.config.get("suchgebiet", {}).get("max_alter_stunden")
+                        or 0
                     )
-
-                # Nur Anzeigen nicht älter als X Stunden (z. B. 5)
-                max_alter = (
-                    self.config.get("suchgebiet", {}).get("max_alter_stunden")
-                    or 0
-                )
-                if max_alter > 0:
-                    vorher = len(listings)
-                    listings = [l for l in listings if ist_nicht_aelter_als_stunden(l, max_alter)]
-                    if vorher > len(listings):
+                    ist_frisch = alter_pruefer(max_alter)
+                    behalten, ausserhalb, zu_alt = [], 0, 0
+                    for listing in listings:
+                        if not ist_im_einzugsgebiet(listing, self.config)[0]:
+                            ausserhalb += 1
+                        elif not ist_frisch(listing):
+                            zu_alt += 1
+                        else:
+                            behalten.append(listing)
+                    listings = behalten
+                    if ausserhalb:
+                        logger.info(
+                            "Standort-Filter: %d Anzeigen außerhalb Einzugsgebiet entfernt, %d übrig",
+                            ausserhalb, len(listings) + zu_alt,
+                        )
+                    if zu_alt:
                         logger.info(
-                            f"Alter-Filter: {vorher - len(listings)} Anzeigen "
-                            f"älter als {max_alter}h entfernt, {len(listings)} übrig"
+                            "Alter-Filter: %d Anzeigen älter als %sh entfernt, %d übrig",
+                            zu_alt, max_alter, len(listings),
                         )
 
-                # 3. Dedup via Database (wie bisher)
-                neue_listings = [l for l in listings if not self.db.existiert(l.url_hash)]
-                if not neue_listings:
-                    continue
+                    # 3. Dedup via Database (wie bisher)
+                    bekannt = self.db.existierende_hashes(l.url_hash for l in listings)
+                    neue_listings = [l for l in listings if l.url_hash not in bekannt]
+                    if not neue_listings:
+                        continue
 
-                # 4. SuchAgent bewertet neue Listings per GPT (mit Fallback)
-                if self.ki_enabled and self.such_agent:
-                    logger.info(f"  → KI-Bewertung für {len(neue_listings)} neue Listings...")
-                    ergebnisse = self.such_agent.suchen_und_bewerten(neue_listings)
-                else:
-                    ergebnisse = [self.scorer.bewerten(l) for l in neue_listings]
+                    # 4. SuchAgent bewertet neue Listings per GPT (mit Fallback)
+                    if self.ki_enabled and self.such_agent:
+                        logger.info("  → KI-Bewertung für %d neue Listings...", len(neue_listings))
+                        ergebnisse = self.such_agent.suchen_und_bewerten(neue_listings)
+                    else:
+                        ergebnisse = [self.scorer.bewerten(l) for l in neue_listings]
 
-                for ergebnis in ergebnisse:
                     # 5. OutreachAgent erstellt Nachrichten für relevante Leads
-                    if ergebnis.ist_relevant:
-                        if self.ki_enabled and self.outreach_agent:
-                            ergebnis.antwort_vorschlag = self.outreach_agent.nachricht_erstellen(
-                                ergebnis
-                            )
-                        else:
-                            ergebnis.antwort_vorschlag = self.response_gen.generieren(
-                                ergebnis
-                            )
-
-                    # E-Mail-Outreach: Extraktion + Freigabe-Anfrage per Telegram
-                    if self.outreach_manager and ergebnis.ist_relevant:
-                        try:
-                            self.outreach_manager.outreach_starten(ergebnis)
-                        except Exception as e:
-                            logger.error(f"Fehler bei outreach_starten: {e}")
-
-                    # 7. Database speichern (inkl. KI-Begründung)
-                    self.db.speichern(
-                        url_hash=ergebnis.listing.url_hash,
-                        url=ergebnis.listing.url,
-                        titel=ergebnis.listing.titel,
-                        beschreibung=ergebnis.listing.beschreibung,
-                        ort=ergebnis.listing.ort,
-                        quelle=ergebnis.listing.quelle.value,
-                        kategorie=ergebnis.kategorie.value,
-                        score=ergebnis.score_gesamt,
-                        prioritaet=ergebnis.prioritaet.value,
-                        antwort_vorschlag=ergebnis.antwort_vorschlag or "",
-                    )
+                    relevante = [e for e in ergebnisse if e.ist_relevant]
+                    for ergebnis, nachricht in zip(relevante, self._nachrichten_erstellen(relevante)):
+                        ergebnis.antwort_vorschlag = nachricht
+
+                    zeilen = []
+                    for ergebnis in ergebnisse:
+                        # E-Mail-Outreach: Extraktion + Freigabe-Anfrage per Telegram
+                        if self.outreach_manager and ergebnis.ist_relevant:
+                            try:
+                                self.outreach_manager.outreach_starten(ergebnis)
+                            except Exception as e:
+                                logger.error("Fehler bei outreach_starten: %s", e)
+
+                        zeilen.append({
+                            "url_hash": ergebnis.listing.url_hash,
+                            "url": ergebnis.listing.url,
+                            "titel": ergebnis.listing.titel,
+                            "beschreibung": ergebnis.listing.beschreibung,
+                            "ort": ergebnis.listing.ort,
+                            "quelle": ergebnis.listing.quelle,
+                            "kategorie": ergebnis.kategorie,
+                            "score": ergebnis.score_gesamt,
+                            "prioritaet": ergebnis.prioritaet,
+                            "antwort_vorschlag": ergebnis.antwort_vorschlag or "",
+                        })
+
+                    # 7. Database speichern (inkl. KI-Begründung) – eine Transaktion pro Scraper
+                    self.db.speichern_bulk(zeilen)
 
                     # 6. Telegram-Benachrichtigung mit KI-Nachricht + Score + Begründung
-                    if ergebnis.ist_relevant:
-                        self.telegram.senden_sync(ergebnis)
-                        neue_ergebnisse += 1
-                        time.sleep(1.5)
+                    for ergebnis in ergebnisse:
+                        if ergebnis.ist_relevant:
+                            neue_ergebnisse += 1
+                            if not self.telegram.digest_puffern(ergebnis):
+                                self.telegram.senden_sync(ergebnis)
 
-            except Exception as e:
-                logger.error(f"Fehler bei Scraper {scraper.name}: {e}")
-                fehler += 1
+                except Exception as e:
+                    logger.error("Fehler bei Scraper %s: %s", scraper.name, e)
+                    fehler += 1
+
+        # Gesammelte gelbe Leads als eine Digest-Nachricht
+        self.telegram.digest_senden()
 
         # Follow-up-E-Mails prüfen und versenden
         if self.outreach_manager:
             try:
                 self.outreach_manager.follow_ups_pruefen()
             except Exception as e:
-                logger.error(f"Fehler bei follow_ups_pruefen: {e}")
+                logger.error("Fehler bei follow_ups_pruefen: %s", e)
 
         # Token-Verbrauch loggen
         if self.ki_enabled and self.ki_client and self.ki_client.ist_verfuegbar:
             verbrauch = self.ki_client.token_verbrauch_heute()
             if verbrauch:
-                logger.info(f"KI-Token-Verbrauch heute: {verbrauch}")
+                logger.info("KI-Token-Verbrauch heute: %s", verbrauch)
 
         logger.info(
-            f"Durchlauf beendet: {neue_ergebnisse} neue relevante Ergebnisse, "
-            f"{fehler} Fehler"
+            "Durchlauf beendet: %d neue relevante Ergebnisse, %d Fehler", neue_ergebnisse, fehler
         )
 
         if fehler > 0:
-            import asyncio
+            # fehler_melden ist synchron (HTTP-API) – kein Event-Loop nötig.
+            # Ergebnisse sind schon gespeichert: Versandfehler nur loggen
             try:
-                asyncio.run(
-                    self.telegram.fehler_melden(
-                        f"Durchlauf hatte {fehler} Scraper-Fehler. "
-                        f"Details im Log."
-                    )
+                self.telegram.fehler_melden(
+                    f"Durchlauf hatte {fehler} Scraper-Fehler. "
+                    f"Details im Log."
                 )
-            except Exception:
-                pass
+            except Exception as e:
+                logger.warning("Fehlermeldung per Telegram nicht gesendet: %s", e)
+
+        return neue_ergebnisse
+
+    def _durchlauf_job(self):
+        """Scheduler-Job: Durchlauf mit Backoff – leere Läufe verdoppeln das Intervall."""
+        if self.durchlauf() == 0:
+            self._leere_durchlaeufe += 1
+        else:
+            self._leere_durchlaeufe = 0
+
+        scraper_config = self.config.get("scraper", {})
+        basis = scraper_config.get("intervall_minuten", 30)
+        max_stufen = scraper_config.get("backoff_max_stufen", 4)
+        intervall = basis * 2 ** min(self._leere_durchlaeufe, max_stufen)
+        if intervall != self._durchlauf_job_ref.interval:
+            # Nur den eigenen Job ersetzen – Tages-Jobs bleiben unberührt
+            schedule.cancel_job(self._durchlauf_job_ref)
+            self._durchlauf_job_ref = schedule.every(intervall).minutes.do(self._durchlauf_job)
+            logger.info(
+                "Scan-Intervall: %d Min. (%d leere Durchläufe in Folge)",
+                intervall, self._leere_durchlaeufe,
+            )
 
     def _strategie_anwenden(self, plan):
         """Wendet Strategie-Vorschläge automatisch an (Self-Improvement)."""
@@ -353,8 +416,9 @@ class AkquiseAgent:
             for begriff in plan.neue_suchbegriffe[:5]:  # Max 5 neue
                 if begriff not in aktuelle["ki_vorschlaege"]:
                     aktuelle["ki_vorschlaege"].append(begriff)
-                    logger.info(f"Neuer Suchbegriff hinzugefügt: {begriff}")
+                    logger.info("Neuer Suchbegriff hinzugefügt: %s", begriff)
             self.config["suchbegriffe"] = aktuelle
+            self._suchbegriffe = None
 
             # Config speichern
             config_path = ROOT / "config.yaml"
@@ -363,35 +427,31 @@ class AkquiseAgent:
                     yaml.safe_dump(self.config, f, allow_unicode=True, default_flow_style=False)
                 logger.info("Strategie-Änderungen in config.yaml gespeichert")
             except Exception as e:
-                logger.error(f"Konnte config.yaml nicht speichern: {e}")
+                logger.error("Konnte config.yaml nicht speichern: %s", e)
 
     def _strategie_vorschlag_senden(self, plan):
         """Sendet Strategie-Vorschläge via Telegram."""
-        text = (
-            "🧠 <b>KI-Strategie-Vorschlag</b>\n\n"
-            f"<b>Neue Suchbegriffe:</b>\n"
-        )
-        for b in plan.neue_suchbegriffe[:5]:
-            text += f"  + {b}\n"
+        zeilen = ["🧠 <b>KI-Strategie-Vorschlag</b>", "", "<b>Neue Suchbegriffe:</b>"]
+        zeilen.extend(f"  + {b}" for b in plan.neue_suchbegriffe[:5])
         if plan.deaktivierte_begriffe:
-            text += f"\n<b>Vorschlag deaktivieren:</b>\n"
-            for b in plan.deaktivierte_begriffe[:5]:
-                text += f"  - {b}\n"
+            zeilen.extend(["", "<b>Vorschlag deaktivieren:</b>"])
+            zeilen.extend(f"  - {b}" for b in plan.deaktivierte_begriffe[:5])
         if plan.plattform_empfehlungen:
-            text += f"\n<b>Plattform-Empfehlungen:</b>\n"
+            zeilen.extend(["", "<b>Plattform-Empfehlungen:</b>"])
             for p in plan.plattform_empfehlungen[:3]:
                 if isinstance(p, dict):
-                    text += f"  → {p.get('name', '?')}: {p.get('begruendung', '')[:80]}\n"
+                    zeilen.append(f"  → {p.get('name', '?')}: {p.get('begruendung', '')[:80]}")
                 else:
-                    text += f"  → {str(p)}\n"
+                    zeilen.append(f"  → {str(p)}")
         if plan.begruendung:
-            text += f"\n<i>{plan.begruendung[:300]}</i>"
+            zeilen.extend(["", f"<i>{plan.begruendung[:300]}</i>"])
+        text = "\n".join(zeilen)
 
         try:
             if self.telegram.send_strategie(text):
                 logger.info("Strategie-Vorschlag via Telegram gesendet")
         except Exception as e:
-            logger.error(f"Fehler beim Senden des Strategie-Vorschlags: {e}")
+            logger.error("Fehler beim Senden des Strategie-Vorschlags: %s", e)
 
     def _b2b_recherche_job(self):
         """Tägliche B2B-Recherche — wird per Scheduler aufgerufen."""
@@ -407,7 +467,7 @@ class AkquiseAgent:
                     f"{self.b2b_manager.tages_zusammenfassung()}"
                 )
         except Exception as e:
-            logger.error(f"B2B-Recherche fehlgeschlagen: {e}")
+            logger.error("B2B-Recherche fehlgeschlagen: %s", e)
 
     def tages_zusammenfassung_senden(self):
         """Sendet die tägliche Zusammenfassung."""
@@ -426,7 +486,7 @@ class AkquiseAgent:
             return
 
         intervall = self.config.get("scraper", {}).get("intervall_minuten", 30)
-        schedule.every(intervall).minutes.do(self.durchlauf)
+        self._durchlauf_job_ref = schedule.every(intervall).minutes.do(self._durchlauf_job)
 
         zusammenfassung_zeit = (
             self.config.get("telegram", {}).get(
@@ -440,25 +500,28 @@ class AkquiseAgent:
         if self.b2b_manager:
             recherche_zeit = self.config.get("b2b", {}).get("recherche_uhrzeit", "09:00")
             schedule.every().day.at(recherche_zeit).do(self._b2b_recherche_job)
-            logger.info(f"B2B-Recherche täglich um {recherche_zeit}")
+            logger.info("B2B-Recherche täglich um %s", recherche_zeit)
 
         cleanup_tage = self.config.get("datenbank", {}).get("cleanup_tage", 30)
         schedule.every().day.at("03:00").do(self.db.cleanup, tage=cleanup_tage)
 
-        logger.info(f"Scheduler gestartet: alle {intervall} Min.")
-        logger.info(f"Tages-Zusammenfassung: {zusammenfassung_zeit}")
+        logger.info("Scheduler gestartet: alle %s Min.", intervall)
+        logger.info("Tages-Zusammenfassung: %s", zusammenfassung_zeit)
         logger.info("Drücke Ctrl+C zum Beenden.")
 
         def shutdown(signum, frame):
             logger.info("Shutdown-Signal empfangen...")
-            self._running = False
+            self._stop.set()
 
         signal.signal(signal.SIGINT, shutdown)
         signal.signal(signal.SIGTERM, shutdown)
 
-        while self._running:
+        # Bis zum nächsten fälligen Job schlafen; wait() kehrt beim Shutdown-Signal sofort zurück.
+        # Obergrenze 60 s, damit Uhrzeit-Sprünge (Suspend, NTP) nicht zu langem Verschlafen führen.
+        while not self._stop.is_set():
             schedule.run_pending()
-            time.sleep(1)
+            idle = schedule.idle_seconds()
+            self._stop.wait(60 if idle is None else min(max(idle, 0), 60))
 
         logger.info("Agent beendet.")
         self.db.close()
@@ -468,7 +531,7 @@ def test_telegram(config_pfad: str = "config.yaml"):
     """Sendet eine Test-Nachricht an Telegram."""
     config_path = ROOT / config_pfad
     with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlLoader)
 
     notifier = TelegramNotifier(config)
     ok = notifier._send_message(
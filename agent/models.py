@@ -1,12 +1,20 @@
 """Datenmodelle für SE Handwerk Akquise-Agent."""
 
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 
 
-class Quelle(Enum):
+def url_hash_berechnen(url: str) -> str:
+    """Dedup-Schlüssel einer URL: BLAKE2b mit 8 Byte Digest (16 Hex-Zeichen)."""
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+
+
+# str-Mixin: Mitglieder lassen sich direkt als SQLite-Parameter binden (kein .value nötig).
+# In f-Strings weiterhin .value verwenden – format() liefert dort "Quelle.GOOGLE".
+class Quelle(str, Enum):
     KLEINANZEIGEN = "kleinanzeigen"
     MYHAMMER = "myhammer"
     GOOGLE = "google"
@@ -15,14 +23,14 @@ class Quelle(Enum):
     MARKT = "markt"
 
 
-class Kategorie(Enum):
+class Kategorie(str, Enum):
     BODEN = "boden"
     MONTAGE = "montage"
     UEBERGABE = "uebergabe"
     SONSTIGES = "sonstiges"
 
 
-class Prioritaet(Enum):
+class Prioritaet(str, Enum):
     GRUEN = "gruen"    # Score >= 70
     GELB = "gelb"      # Score 40-69
     ROT = "rot"        # Score < 40
@@ -46,7 +54,7 @@ class KontaktStatus(Enum):
     ABGESCHLOSSEN = "abgeschlossen"  # kein weiterer Kontakt nötig
 
 
-@dataclass
+@dataclass(slots=True)
 class Listing:
     """Ein gefundenes Inserat/Gesuch von einer Plattform."""
     url: str
@@ -59,15 +67,18 @@ class Listing:
     preis: Optional[str] = None
     kontakt: Optional[str] = None
     rohdaten: Optional[dict] = None
+    # Cache für url_hash (slots=True erlaubt kein cached_property)
+    _url_hash: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def url_hash(self) -> str:
-        """Eindeutiger Hash der URL für Deduplizierung."""
-        import hashlib
-        return hashlib.md5(self.url.encode()).hexdigest()
+        """Eindeutiger Hash der URL für Deduplizierung (einmal pro Listing berechnet)."""
+        if self._url_hash is None:
+            self._url_hash = url_hash_berechnen(self.url)
+        return self._url_hash
 
 
-@dataclass
+@dataclass(slots=True)
 class Bewertungsergebnis:
     """Ergebnis der Bewertung eines Listings."""
     listing: Listing
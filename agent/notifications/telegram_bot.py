@@ -1,14 +1,54 @@
 """Telegram-Benachrichtigungen für den Akquise-Agent."""
 
+import html
 import os
 import requests
 from typing import Optional
 
-from models import Bewertungsergebnis
+from models import Bewertungsergebnis, Prioritaet
 from utils.logger import setup_logger
+from utils.ratelimit import TokenBucket
 
 logger = setup_logger("se_handwerk.telegram")
 
+# callback_data-Präfix → genehmigt
+B2C_ENTSCHEIDUNGEN = {"oja": True, "onein": False}
+B2B_ENTSCHEIDUNGEN = {"oja_b2b": True, "onein_b2b": False}
+
+# (Label, callback_data-Präfix) der Freigabe-Buttons
+B2C_FREIGABE_BUTTONS = (("✅ Freigeben", "oja"), ("❌ Ablehnen", "onein"))
+B2B_FREIGABE_BUTTONS = (("✅ Senden", "oja_b2b"), ("❌ Ablehnen", "onein_b2b"))
+
+PRIORITAET_EMOJI = {Prioritaet.GRUEN: "🟢", Prioritaet.GELB: "🟡", Prioritaet.ROT: "🔴"}
+
+B2B_TYP_EMOJI = {
+    "hausverwaltung": "🏢", "makler": "🏠", "wohnungsbau": "🏗️",
+    "facility": "🔧", "umzug": "🚚", "sonstiges": "📋",
+}
+
+
+ZUSAMMENFASSUNG_KOPF = (
+    "📊 <b>Tages-Zusammenfassung</b>\n"
+    "Gesamt: {gesamt} | 🟢 {gruen} | 🟡 {gelb} | 🔴 {rot}\n\n"
+)
+
+
+def _freigabe_keyboard(kontakt_id: int, buttons: tuple) -> dict:
+    """Inline-Keyboard mit einer Button-Zeile für die Kontakt-ID."""
+    return {"inline_keyboard": [[
+        {"text": label, "callback_data": f"{praefix}:{kontakt_id}"}
+        for label, praefix in buttons
+    ]]}
+
+
+def _entscheidung_parsen(data: str, entscheidungen: dict) -> Optional[dict]:
+    """Dekodiert 'praefix:id' in {id, genehmigt} oder None."""
+    praefix, _, kontakt_id = data.partition(":")
+    genehmigt = entscheidungen.get(praefix)
+    if genehmigt is None or not kontakt_id.isdigit():
+        return None
+    return {"id": int(kontakt_id), "genehmigt": genehmigt}
+
 
 class TelegramNotifier:
     def __init__(self, config: dict):
@@ -18,6 +58,15 @@ class TelegramNotifier:
         self.token = token
         self.chat_id = str(chat_id) if chat_id else None
         self.api_url = f"https://api.telegram.org/bot{token}" if token else None
+        # Eine Session für alle API-Aufrufe (Keep-Alive statt neuer TLS-Verbindung pro Nachricht)
+        self._session = requests.Session()
+        # Gelbe Leads sammeln und gebündelt als Digest senden
+        telegram_config = config.get("telegram", {})
+        self._digest_gelb = telegram_config.get("digest_gelb", True)
+        self._digest_max = telegram_config.get("digest_max", 10)
+        self._digest: list[Bewertungsergebnis] = []
+        # Telegram erlaubt ca. 1 Nachricht/s pro Chat; gewartet wird nur direkt vor dem Senden
+        self._limiter = TokenBucket(telegram_config.get("max_pro_sekunde", 1.0))
 
     def _send_message(self, text: str) -> bool:
         """Sendet eine Nachricht über die Telegram API."""
@@ -25,7 +74,8 @@ class TelegramNotifier:
             logger.warning("Telegram: Bot-Token oder Chat-ID nicht konfiguriert")
             return False
         try:
-            response = requests.post(
+            self._limiter.warten()
+            response = self._session.post(
                 f"{self.api_url}/sendMessage",
                 data={
                     "chat_id": self.chat_id,
@@ -43,7 +93,7 @@ class TelegramNotifier:
 
     def _format_nachricht(self, ergebnis: Bewertungsergebnis) -> str:
         e = ergebnis
-        prioritaet_emoji = {"gruen": "🟢", "gelb": "🟡", "rot": "🔴"}.get(e.prioritaet.value, "⚪")
+        prioritaet_emoji = PRIORITAET_EMOJI.get(e.prioritaet, "⚪")
         text = (
             f"{prioritaet_emoji} <b>{e.listing.titel[:80]}</b>\n"
             f"📊 Score: {e.score_gesamt}/100 "
@@ -67,19 +117,50 @@ class TelegramNotifier:
         logger.info(f"Telegram: Nachricht gesendet für '{ergebnis.listing.titel[:50]}'")
         return True
 
+    def digest_puffern(self, ergebnis: Bewertungsergebnis) -> bool:
+        """Puffert gelbe Leads für den Digest. False = sofort einzeln senden."""
+        if not self._digest_gelb or ergebnis.prioritaet != Prioritaet.GELB:
+            return False
+        self._digest.append(ergebnis)
+        if len(self._digest) >= self._digest_max:
+            self.digest_senden()
+        return True
+
+    def _format_digest(self, ergebnisse: list[Bewertungsergebnis]) -> str:
+        lines = [f"🟡 <b>{len(ergebnisse)} weitere Leads</b>", ""]
+        for e in ergebnisse:
+            lines.append(
+                f"• <a href=\"{html.escape(e.listing.url, quote=True)}\">"
+                f"{html.escape(e.listing.titel[:60])}</a> "
+                f"| {html.escape(e.listing.ort or '-')} | {e.score_gesamt}/100"
+            )
+        return "\n".join(lines)
+
+    def digest_senden(self) -> bool:
+        """Sendet alle gepufferten gelben Leads als eine Nachricht."""
+        if not self._digest:
+            return True
+        ergebnisse = list(self._digest)
+        if not self._send_message(self._format_digest(ergebnisse)):
+            # Puffer behalten – die Leads stehen schon als gesehen in der DB
+            return False
+        del self._digest[:len(ergebnisse)]
+        logger.info(f"Telegram: Digest mit {len(ergebnisse)} Leads gesendet")
+        return True
+
     def fehler_melden(self, nachricht: str) -> bool:
         """Sendet eine Fehlermeldung."""
-        return self._send_message(f"⚠️ <b>Agent-Fehler</b>\n\n{nachricht}")
+        # Fehlertexte enthalten oft "<" oder "&" (Exceptions) – sonst lehnt Telegram das HTML ab
+        return self._send_message(f"⚠️ <b>Agent-Fehler</b>\n\n{html.escape(nachricht)}")
 
     def _format_zusammenfassung(self, statistik: dict, top: list) -> str:
-        lines = [
-            "📊 <b>Tages-Zusammenfassung</b>",
-            f"Gesamt: {statistik.get('gesamt', 0)} | 🟢 {statistik.get('gruen', 0)} | 🟡 {statistik.get('gelb', 0)} | 🔴 {statistik.get('rot', 0)}",
-            "",
-        ]
-        for i, row in enumerate(top, 1):
-            lines.append(f"{i}. [{row.get('prioritaet', '?')}] {row.get('titel', '')[:50]} | {row.get('ort', '')}")
-        return "\n".join(lines)
+        kopf = ZUSAMMENFASSUNG_KOPF.format_map({
+            k: statistik.get(k, 0) for k in ("gesamt", "gruen", "gelb", "rot")
+        })
+        return kopf + "\n".join(
+            f"{i}. [{row.get('prioritaet', '?')}] {row.get('titel', '')[:50]} | {row.get('ort', '')}"
+            for i, row in enumerate(top, 1)
+        )
 
     def zusammenfassung_sync(self, statistik: dict, top: list) -> bool:
         """Sendet eine Tageszusammenfassung."""
@@ -101,12 +182,7 @@ class TelegramNotifier:
             logger.warning("Telegram: nicht konfiguriert – Freigabe-Anfrage übersprungen")
             return False
 
-        keyboard = {
-            "inline_keyboard": [[
-                {"text": "✅ Freigeben", "callback_data": f"oja:{kontakt_id}"},
-                {"text": "❌ Ablehnen",  "callback_data": f"onein:{kontakt_id}"},
-            ]]
-        }
+        keyboard = _freigabe_keyboard(kontakt_id, B2C_FREIGABE_BUTTONS)
         text = (
             f"📧 <b>E-Mail-Freigabe</b>\n"
             f"An: <code>{empfaenger}</code>\n"
@@ -114,7 +190,8 @@ class TelegramNotifier:
             f"<i>{vorschau[:200]}…</i>"
         )
         try:
-            r = requests.post(
+            self._limiter.warten()
+            r = self._session.post(
                 f"{self.api_url}/sendMessage",
                 json={
                     "chat_id": self.chat_id,
@@ -143,14 +220,8 @@ class TelegramNotifier:
         """Sendet B2B-Freigabe-Anfrage mit Inline-Keyboard."""
         if not self.token or not self.chat_id:
             return False
-        typ_emoji = {
-            "hausverwaltung": "🏢", "makler": "🏠", "wohnungsbau": "🏗️",
-            "facility": "🔧", "umzug": "🚚", "sonstiges": "📋",
-        }.get(typ, "📋")
-        keyboard = {"inline_keyboard": [[
-            {"text": "✅ Senden",   "callback_data": f"oja_b2b:{kontakt_id}"},
-            {"text": "❌ Ablehnen", "callback_data": f"onein_b2b:{kontakt_id}"},
-        ]]}
+        typ_emoji = B2B_TYP_EMOJI.get(typ, "📋")
+        keyboard = _freigabe_keyboard(kontakt_id, B2B_FREIGABE_BUTTONS)
         text = (
             f"{typ_emoji} <b>B2B-Outreach Freigabe</b>\n"
             f"Firma: <b>{firma[:60]}</b> ({typ})\n"
@@ -159,7 +230,8 @@ class TelegramNotifier:
             f"<i>{vorschau[:200]}…</i>"
         )
         try:
-            r = requests.post(
+            self._limiter.warten()
+            r = self._session.post(
                 f"{self.api_url}/sendMessage",
                 json={"chat_id": self.chat_id, "text": text,
                       "parse_mode": "HTML", "reply_markup": keyboard},
@@ -176,7 +248,7 @@ class TelegramNotifier:
         # aber filtert nur b2b-spezifische callback_data
         offset = int(db.setting_lesen("telegram_update_offset") or 0)
         try:
-            r = requests.get(
+            r = self._session.get(
                 f"{self.api_url}/getUpdates",
                 params={"offset": offset, "timeout": 0,
                         "allowed_updates": ["callback_query"]},
@@ -196,21 +268,13 @@ class TelegramNotifier:
             if not cq:
                 continue
             try:
-                requests.post(f"{self.api_url}/answerCallbackQuery",
+                self._session.post(f"{self.api_url}/answerCallbackQuery",
                               json={"callback_query_id": cq["id"]}, timeout=5)
             except Exception:
                 pass
-            data = cq.get("data", "")
-            if data.startswith("oja_b2b:"):
-                try:
-                    ergebnisse.append({"id": int(data.split(":")[1]), "genehmigt": True})
-                except (ValueError, IndexError):
-                    pass
-            elif data.startswith("onein_b2b:"):
-                try:
-                    ergebnisse.append({"id": int(data.split(":")[1]), "genehmigt": False})
-                except (ValueError, IndexError):
-                    pass
+            entscheidung = _entscheidung_parsen(cq.get("data", ""), B2B_ENTSCHEIDUNGEN)
+            if entscheidung:
+                ergebnisse.append(entscheidung)
         return ergebnisse
 
     def b2b_antwort_melden(self, firma: str, email: str, typ: str) -> None:
@@ -233,7 +297,7 @@ class TelegramNotifier:
 
         offset = int(db.setting_lesen("telegram_update_offset") or 0)
         try:
-            r = requests.get(
+            r = self._session.get(
                 f"{self.api_url}/getUpdates",
                 params={
                     "offset": offset,
@@ -260,7 +324,7 @@ class TelegramNotifier:
 
             # Callback bestätigen (verhindert Ladeanzeige im Client)
             try:
-                requests.post(
+                self._session.post(
                     f"{self.api_url}/answerCallbackQuery",
                     json={"callback_query_id": cq["id"]},
                     timeout=5,
@@ -268,17 +332,9 @@ class TelegramNotifier:
             except Exception:
                 pass
 
-            data = cq.get("data", "")
-            if data.startswith("oja:"):
-                try:
-                    ergebnisse.append({"id": int(data.split(":")[1]), "genehmigt": True})
-                except (ValueError, IndexError):
-                    pass
-            elif data.startswith("onein:"):
-                try:
-                    ergebnisse.append({"id": int(data.split(":")[1]), "genehmigt": False})
-                except (ValueError, IndexError):
-                    pass
+            entscheidung = _entscheidung_parsen(cq.get("data", ""), B2C_ENTSCHEIDUNGEN)
+            if entscheidung:
+                ergebnisse.append(entscheidung)
 
         if ergebnisse:
             logger.info(f"Telegram-Callbacks verarbeitet: {len(ergebnisse)} Entscheidungen")
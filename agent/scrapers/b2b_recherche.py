@@ -18,8 +18,11 @@ from urllib.parse import urljoin, urlparse
 import requests
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
 
 from models import B2BKontakt, B2BKontaktTyp
+from scrapers.base import UA_POOL_GROESSE, elem_text, erstes_element
 from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.b2b.recherche")
@@ -27,6 +30,14 @@ logger = setup_logger("se_handwerk.b2b.recherche")
 EMAIL_REGEX = re.compile(r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b')
 TEL_REGEX   = re.compile(r'(?:\+49|0)[\s\-]?\d{2,5}[\s\-]?\d{3,8}[\s\-]?\d{0,6}')
 
+# Gelbe-Seiten-Selektoren, einmalig beim Import nach XPath kompiliert
+SEL_GS_TREFFER = CSSSelector("article.mod-Treffer")
+SEL_GS_NAME = CSSSelector("p.mod-Treffer__name, h2.mod-Treffer__name")
+SEL_GS_ADRESSE = CSSSelector(".mod-AdresseKompakt, .mod-Treffer__adresse")
+SEL_GS_WEBSITE = CSSSelector("a[href*='http'][class*='web'], a.mod-MiniMap--website")
+SEL_GS_DATA_URL = CSSSelector("a[data-url]")
+SEL_GS_TELEFON = CSSSelector("[class*='telefon'], [class*='phone']")
+
 # Gelbe-Seiten-Suchkategorien pro B2B-Typ
 GELBESEITEN_KATEGORIEN: dict[B2BKontaktTyp, list[str]] = {
     B2BKontaktTyp.HAUSVERWALTUNG: [
@@ -94,13 +105,15 @@ class B2BRecherche:
         self.config = config
         self._b2b_cfg = config.get("b2b", {})
         self._session = requests.Session()
-        self._ua = UserAgent()
+        ua = UserAgent()
+        self._ua_pool = tuple(ua.random for _ in range(UA_POOL_GROESSE))
         self._delay = config.get("scraper", {}).get("request_delay_sekunden", [2, 4])
         self._timeout = config.get("scraper", {}).get("timeout_sekunden", 15)
+        self._html_parser = config.get("scraper", {}).get("html_parser", "lxml")
 
     def _headers(self) -> dict:
         return {
-            "User-Agent": self._ua.random,
+            "User-Agent": random.choice(self._ua_pool),
             "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "de-DE,de;q=0.9",
             "DNT": "1",
@@ -121,7 +134,7 @@ class B2BRecherche:
                 time.sleep(20)
             return None
         except Exception as e:
-            logger.debug(f"GET fehlgeschlagen {url}: {e}")
+            logger.debug("GET fehlgeschlagen %s: %s", url, e)
             return None
 
     # ── Gelbe Seiten ────────────────────────────────────────────────────────
@@ -135,32 +148,36 @@ class B2BRecherche:
         if not html:
             return []
 
-        soup = BeautifulSoup(html, "html.parser")
+        try:
+            root = lxml_html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug("Gelbe Seiten nicht parsbar %s: %s", url, e)
+            return []
         kontakte: list[B2BKontakt] = []
 
-        for treffer in soup.select("article.mod-Treffer"):
+        for treffer in SEL_GS_TREFFER(root):
             try:
                 # Firmenname
-                name_el = treffer.select_one("p.mod-Treffer__name, h2.mod-Treffer__name")
-                if not name_el:
+                name_el = erstes_element(treffer, SEL_GS_NAME)
+                if name_el is None:
                     continue
-                firma = name_el.get_text(strip=True)
+                firma = elem_text(name_el)
 
                 # Adresse / Ort
-                adr_el = treffer.select_one(".mod-AdresseKompakt, .mod-Treffer__adresse")
-                ort_text = adr_el.get_text(" ", strip=True) if adr_el else ort
+                adr_el = erstes_element(treffer, SEL_GS_ADRESSE)
+                # Textknoten einzeln, damit <br>-getrennte Zeilen nicht zusammenkleben
+                ort_text = " ".join(" ".join(adr_el.itertext()).split()) if adr_el is not None else ort
 
                 # Website-Link
-                web_el = treffer.select_one("a[href*='http'][class*='web'], a.mod-MiniMap--website")
-                website = web_el.get("href", "").strip() if web_el else ""
+                web_el = erstes_element(treffer, SEL_GS_WEBSITE)
+                website = web_el.get("href", "").strip() if web_el is not None else ""
                 if not website:
                     # Fallback: data-url oder weiteres Link-Pattern
-                    web_el2 = treffer.select_one("a[data-url]")
-                    website = web_el2.get("data-url", "") if web_el2 else ""
+                    web_el2 = erstes_element(treffer, SEL_GS_DATA_URL)
+                    website = web_el2.get("data-url", "") if web_el2 is not None else ""
 
                 # Telefon
-                tel_el = treffer.select_one("[class*='telefon'], [class*='phone']")
-                telefon = tel_el.get_text(strip=True) if tel_el else None
+                telefon = elem_text(erstes_element(treffer, SEL_GS_TELEFON)) or None
 
                 if not firma:
                     continue
@@ -175,7 +192,7 @@ class B2BRecherche:
                     quelle="gelbeseiten",
                 ))
             except Exception as e:
-                logger.debug(f"Gelbe-Seiten Parsing-Fehler: {e}")
+                logger.debug("Gelbe-Seiten Parsing-Fehler: %s", e)
                 continue
 
         logger.info(f"Gelbe Seiten '{kategorie}/{ort}': {len(kontakte)} Einträge")
@@ -210,7 +227,7 @@ class B2BRecherche:
                     quelle="google",
                 ))
         except Exception as e:
-            logger.debug(f"Google-Suche '{suchbegriff}' fehlgeschlagen: {e}")
+            logger.debug("Google-Suche '%s' fehlgeschlagen: %s", suchbegriff, e)
 
         logger.info(f"Google '{suchbegriff}': {len(kontakte)} URLs gefunden")
         return kontakte
@@ -235,7 +252,7 @@ class B2BRecherche:
             if not html:
                 continue
 
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, self._html_parser)
             text = soup.get_text(" ", strip=True)
 
             # E-Mail extrahieren
@@ -266,7 +283,7 @@ class B2BRecherche:
             telefon = tel_treffer[0].strip() if tel_treffer else None
 
             if email:
-                logger.debug(f"Impressum {url} → {email}")
+                logger.debug("Impressum %s → %s", url, email)
                 return firma, email, telefon
 
         return None, None, None
@@ -1,27 +1,114 @@
 """Abstrakte Basis-Klasse für alle Scraper."""
 
+import codecs
 import random
+import re
 import time
 from abc import ABC, abstractmethod
 from typing import Optional
 
 import requests
 from fake_useragent import UserAgent
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 from models import Listing
 from utils.logger import setup_logger
 
+# Anzahl vorab gezogener User-Agent-Strings pro Scraper
+UA_POOL_GROESSE = 64
+
+# <meta charset="…"> und <meta http-equiv="Content-Type" content="…; charset=…">
+_RE_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+
+def erstes_element(elem, selector):
+    """Erstes Treffer-Element eines CSS-Selektors (wie BS4 select_one) oder None.
+
+    selector: vorkompilierter CSSSelector oder CSS-String.
+    """
+    treffer = selector(elem) if callable(selector) else elem.cssselect(selector)
+    return treffer[0] if treffer else None
+
+
+def elem_text(elem) -> str:
+    """Text eines lxml-Elements mit normalisiertem Whitespace ("" wenn None)."""
+    return " ".join(elem.text_content().split()) if elem is not None else ""
+
+
+def html_encoding(response: requests.Response, anfang: bytes) -> str:
+    """Kodierung für lxml: Charset aus dem Header, sonst aus <meta> im Seitenanfang, sonst UTF-8.
+
+    Ohne Angabe würde libxml2 Latin-1 annehmen; UTF-8 blind zu erzwingen zerstört
+    dagegen Seiten, die ihr Charset nur im <meta> deklarieren.
+    """
+    if "charset=" in response.headers.get("Content-Type", "").lower() and response.encoding:
+        return response.encoding
+    treffer = _RE_META_CHARSET.search(anfang[:64 * 1024])
+    if treffer:
+        try:
+            # Normalisierter Name – libxml2 kennt z. B. "iso8859-1", aber nicht "latin-1"
+            return codecs.lookup(treffer.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def _abruf_schluessel(url: str, params: Optional[dict]) -> tuple:
+    """Schlüssel für BaseScraper._abgerufen: URL plus sortierte Query-Parameter."""
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def _wartezeit_429(response: requests.Response, attempt: int) -> int:
+    """Wartezeit nach HTTP 429: Retry-After (Sekunden, max. 60), sonst 5 s je Versuch bis 30 s."""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(int(retry_after), 60)
+    return min(30, 5 * attempt)
+
 
 class BaseScraper(ABC):
     """Basis-Scraper mit Rate-Limiting, User-Agent Rotation und Retry-Logik."""
 
+    # False = Platzhalter ohne echte Suche; wird in _init_scrapers nicht registriert
+    implementiert = True
+
     def __init__(self, config: dict):
         self.config = config
         self.scraper_config = config.get("scraper", {})
+        # BS4-Parser: "lxml" (C, schnell) oder "html.parser" (reines Python, ohne Extra-Abhängigkeit)
+        self.html_parser = self.scraper_config.get("html_parser", "lxml")
         self.logger = setup_logger(f"se_handwerk.{self.name}")
         self.session = requests.Session()
-        self._ua = UserAgent()
+        # Keep-Alive-Pool pro Scraper; Verbindungsaufbau-Fehler wiederholt urllib3 sofort,
+        # HTTP-Status-Retries (429/5xx) bleiben in _request mit Wartezeiten.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, read=0, backoff_factor=0.5),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # UserAgent.random ist teuer – einmal einen Pool ziehen, pro Request nur auswählen
+        ua = UserAgent()
+        self._ua_pool = tuple(ua.random for _ in range(UA_POOL_GROESSE))
+        self.session.headers.update({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "de-DE,de;q=0.9,en;q=0.5",
+            # Nur was urllib3 dekodieren kann – "br" nur mit installiertem brotli
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+            "DNT": "1",
+        })
         self._update_headers()
+        # Frühester Zeitpunkt (time.monotonic) für den nächsten Request an diese Plattform
+        self._naechste_anfrage_ab = 0.0
+        # Ergebnisse pro (suchbegriff, region) innerhalb eines Durchlaufs
+        self._such_cache: dict[tuple[str, str], list[Listing]] = {}
+        # Im laufenden Durchlauf bereits erfolgreich geladene und geparste URLs (inkl. Parameter)
+        self._abgerufen: set[tuple] = set()
 
     @property
     @abstractmethod
@@ -32,67 +119,159 @@ class BaseScraper(ABC):
     def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
         ...
 
+    def neuer_durchlauf(self):
+        """Zu Beginn jedes Durchlaufs aufrufen – verwirft zwischengespeicherte Suchergebnisse."""
+        self._such_cache.clear()
+        self._abgerufen.clear()
+
     def _update_headers(self):
-        self.session.headers.update({
-            "User-Agent": self._ua.random,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "de-DE,de;q=0.9,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "DNT": "1",
-        })
+        self.session.headers["User-Agent"] = random.choice(self._ua_pool)
 
-    def _request(self, url: str, params: Optional[dict] = None) -> Optional[requests.Response]:
+    def _request(
+        self, url: str, params: Optional[dict] = None, stream: bool = False
+    ) -> Optional[requests.Response]:
+        """GET mit Retry/Rate-Limit. Bei stream=True liest der Aufrufer den Body selbst."""
         max_retries = self.scraper_config.get("max_retries", 3)
-        timeout = self.scraper_config.get("timeout_sekunden", 30)
+        timeout_lesen = self.scraper_config.get("timeout_sekunden", 30)
+        # (Connect, Read): tote Hosts schnell erkennen, langsame Seiten trotzdem abwarten
+        timeout = (min(5, timeout_lesen), timeout_lesen)
         delay_range = self.scraper_config.get("request_delay_sekunden", [2, 5])
 
+        # Verschiedene (Begriff, Region)-Paare können dieselbe Such-URL ergeben (z. B. gleiche
+        # PLZ); deren Listings sind schon im Ergebnis, also weder warten noch erneut laden.
+        if _abruf_schluessel(url, params) in self._abgerufen:
+            self.logger.debug("Bereits in diesem Durchlauf geladen: %s", url)
+            return None
+
         for attempt in range(1, max_retries + 1):
             try:
-                delay = random.uniform(delay_range[0], delay_range[1])
-                time.sleep(delay)
+                # Nur die Restzeit seit dem letzten Request warten – der erste geht sofort raus
+                rest = self._naechste_anfrage_ab - time.monotonic()
+                if rest > 0:
+                    time.sleep(rest)
                 self._update_headers()
-                self.logger.debug(f"Request #{attempt}: {url}")
-                response = self.session.get(url, params=params, timeout=timeout)
+                self.logger.debug("Request #%d: %s", attempt, url)
+                try:
+                    response = self.session.get(url, params=params, timeout=timeout, stream=True)
+                finally:
+                    self._naechste_anfrage_ab = time.monotonic() + random.uniform(*delay_range)
                 if response.status_code == 200:
+                    if self._zu_gross(response, url, stream):
+                        return None
                     return response
+                response.close()
                 if response.status_code == 429:
-                    wait = min(30, 5 * attempt)
-                    self.logger.warning(f"Rate-Limit (429) - warte {wait}s")
-                    time.sleep(wait)
+                    wait = _wartezeit_429(response, attempt)
+                    self.logger.warning("Rate-Limit (429) - warte %ss", wait)
+                    self._naechste_anfrage_ab = time.monotonic() + wait
                     continue
                 if response.status_code == 403:
-                    self.logger.warning(f"Zugriff verweigert (403) für {url}")
+                    self.logger.warning("Zugriff verweigert (403) für %s", url)
                     return None
-                self.logger.warning(f"HTTP {response.status_code} für {url} (Versuch {attempt}/{max_retries})")
+                self.logger.warning("HTTP %s für %s (Versuch %d/%d)", response.status_code, url, attempt, max_retries)
             except requests.exceptions.Timeout:
-                self.logger.warning(f"Timeout für {url} (Versuch {attempt}/{max_retries})")
+                self.logger.warning("Timeout für %s (Versuch %d/%d)", url, attempt, max_retries)
             except requests.exceptions.ConnectionError:
-                self.logger.warning(f"Verbindungsfehler für {url} (Versuch {attempt}/{max_retries})")
+                self.logger.warning("Verbindungsfehler für %s (Versuch %d/%d)", url, attempt, max_retries)
             except requests.exceptions.RequestException as e:
                 self.logger.error(f"Request-Fehler: {e}")
                 return None
         self.logger.error(f"Alle {max_retries} Versuche fehlgeschlagen für {url}")
         return None
 
+    def _zu_gross(self, response: requests.Response, url: str, stream: bool = False) -> bool:
+        """True (mit Warnung), wenn die Antwort scraper.max_html_bytes überschreitet.
+
+        Angekündigte Größe wird vor dem Download geprüft, sonst nach dem Einlesen
+        (bei stream=True prüft _html_laden beim Lesen).
+        """
+        max_bytes = self.scraper_config.get("max_html_bytes", 5_000_000)
+        laenge = response.headers.get("Content-Length", "")
+        if laenge.isdigit() and int(laenge) > max_bytes:
+            response.close()
+        elif stream or len(response.content) <= max_bytes:
+            return False
+        self.logger.warning("Antwort größer als %d Bytes – übersprungen: %s", max_bytes, url)
+        return True
+
+    def _html_laden(self, url: str, params: Optional[dict] = None, marker: tuple = ()):
+        """Lädt eine Seite und parst sie inkrementell, während die Daten ankommen.
+
+        marker: Byte-Strings, von denen mindestens einer vorkommen muss (z.B. b"aditem").
+        Bis zum ersten Treffer werden Chunks nur gepuffert – Seiten ohne Treffer
+        (Captcha, Fehlerseite, 0 Ergebnisse) erreichen den Parser nie.
+        Gibt das lxml-Root-Element zurück oder None.
+        """
+        response = self._request(url, params, stream=True)
+        if response is None:
+            return None
+        max_bytes = self.scraper_config.get("max_html_bytes", 5_000_000)
+        # Erst mit den ersten Bytes anlegen – die Kodierung kann im <meta> stehen
+        parser = None
+        gelesen = 0
+        puffer: list[bytes] = []
+        # Überlappung zwischen Chunks, damit Marker an Chunk-Grenzen gefunden werden
+        ueberlappung = max((len(m) for m in marker), default=1) - 1
+        rest = b""
+        gefunden = not marker
+        try:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                gelesen += len(chunk)
+                if gelesen > max_bytes:
+                    self.logger.warning("Antwort größer als %d Bytes – übersprungen: %s", max_bytes, url)
+                    return None
+                if not gefunden:
+                    fenster = rest + chunk
+                    puffer.append(chunk)
+                    if not any(m in fenster for m in marker):
+                        rest = fenster[-ueberlappung:] if ueberlappung else b""
+                        continue
+                    gefunden = True
+                    chunk = b"".join(puffer)
+                    puffer = []
+                if parser is None:
+                    parser = lxml_html.HTMLParser(encoding=html_encoding(response, chunk))
+                parser.feed(chunk)
+            if not gefunden:
+                self.logger.debug("Keine Ergebnis-Marker auf %s – Parsing übersprungen", url)
+                return None
+            if parser is None:
+                self.logger.warning("Leere Antwort von %s", url)
+                return None
+            root = parser.close()
+            # Erst nach erfolgreichem Parsen als erledigt merken – sonst würde ein
+            # Lese-/Parse-Fehler den Retry im nächsten (Begriff, Region)-Paar blockieren
+            self._abgerufen.add(_abruf_schluessel(url, params))
+            return root
+        except (requests.exceptions.RequestException, etree.LxmlError) as e:
+            self.logger.warning("HTML von %s nicht lesbar: %s", url, e)
+            return None
+        finally:
+            response.close()
+
     def alle_suchen(self, suchbegriffe: list[str], regionen: list[str]) -> list[Listing]:
         alle_listings = []
         max_pro_suche = self.scraper_config.get("max_ergebnisse_pro_suche", 20)
         for begriff in suchbegriffe:
             for region in regionen:
                 self.logger.info(f"Suche: '{begriff}' in '{region}'")
+                schluessel = (begriff, region)
+                if schluessel in self._such_cache:
+                    self.logger.debug("Suche '%s' / '%s' bereits abgerufen – Cache", begriff, region)
+                    alle_listings.extend(self._such_cache[schluessel])
+                    continue
                 try:
                     listings = self.suchen(begriff, region)
                     listings = listings[:max_pro_suche]
+                    self._such_cache[schluessel] = listings
                     alle_listings.extend(listings)
                     self.logger.info(f"  → {len(listings)} Ergebnisse")
                 except Exception as e:
                     self.logger.error(f"Fehler bei Suche '{begriff}' / '{region}': {e}")
-        gesehen = set()
-        unique = []
+        # Dedup nach URL: dict behält Einfügereihenfolge, setdefault das erste Vorkommen
+        eindeutig: dict[str, Listing] = {}
         for listing in alle_listings:
-            if listing.url_hash not in gesehen:
-                gesehen.add(listing.url_hash)
-                unique.append(listing)
+            eindeutig.setdefault(listing.url_hash, listing)
+        unique = list(eindeutig.values())
         self.logger.info(f"{self.name}: {len(unique)} eindeutige Ergebnisse (von {len(alle_listings)} gesamt)")
         return unique
@@ -1,8 +1,12 @@
 """Scraper für Google-Suche (Site-Filter)."""
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import quote_plus
 
+import requests
+
 from models import Listing, Quelle
 from scrapers.base import BaseScraper
 
@@ -11,24 +15,44 @@ try:
 except ImportError:
     search = None
 
+CSE_URL = "https://www.googleapis.com/customsearch/v1"
+CSE_MAX_PRO_SEITE = 10
+
 
 class GoogleScraper(BaseScraper):
+    def __init__(self, config: dict):
+        super().__init__(config)
+        google_config = config.get("google", {})
+        sites = google_config.get("site_filter", ["nebenan.de", "kleinanzeigen.de"])
+        self._site_filter = " OR ".join("site:" + s for s in sites)
+        self._max_results = google_config.get("max_results", 10)
+        # Custom Search JSON API (optional) – ohne Key Fallback auf googlesearch-python
+        self._api_key = os.getenv("GOOGLE_API_KEY") or google_config.get("api_key")
+        self._cse_id = os.getenv("GOOGLE_CSE_ID") or google_config.get("cse_id")
+
     @property
     def name(self) -> str:
         return "google"
 
     def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
-        if search is None:
+        query = f'"{suchbegriff}" {region} ({self._site_filter})'
+        self.logger.debug("Google-Query: %s", query)
+        if self._api_key and self._cse_id:
+            listings = self._suchen_cse(query, suchbegriff, region)
+        elif search is None:
             self.logger.warning("googlesearch-python nicht installiert")
             return []
-        sites = self.config.get("google", {}).get("site_filter", ["nebenan.de", "kleinanzeigen.de"])
-        max_results = self.config.get("google", {}).get("max_results", 10)
-        query = f'"{suchbegriff}" {region} ({" OR ".join("site:" + s for s in sites)})'
-        self.logger.debug(f"Google-Query: {query}")
+        else:
+            listings = self._suchen_scraping(query, suchbegriff, region)
+        self.logger.info(f"  → {len(listings)} Ergebnisse")
+        return listings
+
+    def _suchen_scraping(self, query: str, suchbegriff: str, region: str) -> list[Listing]:
         listings = []
+        jetzt = datetime.now()
         try:
             for url in search(query):
-                if len(listings) >= max_results:
+                if len(listings) >= self._max_results:
                     break
                 listings.append(Listing(
                     url=url,
@@ -36,9 +60,53 @@ class GoogleScraper(BaseScraper):
                     beschreibung="",
                     ort=region,
                     quelle=Quelle.GOOGLE,
-                    datum_gefunden=datetime.now(),
+                    datum_gefunden=jetzt,
                 ))
         except Exception as e:
             self.logger.error(f"Google-Suche fehlgeschlagen: {e}")
-        self.logger.info(f"  → {len(listings)} Ergebnisse")
         return listings
+
+    def _suchen_cse(self, query: str, suchbegriff: str, region: str) -> list[Listing]:
+        """Fragt alle Ergebnisseiten der Custom Search API parallel ab."""
+        starts = range(1, self._max_results + 1, CSE_MAX_PRO_SEITE)
+        if not starts:  # max_results: 0
+            return []
+        with ThreadPoolExecutor(max_workers=len(starts)) as executor:
+            seiten = list(executor.map(lambda start: self._cse_seite(query, start), starts))
+
+        jetzt = datetime.now()
+        listings = []
+        for items in seiten:
+            for item in items:
+                if len(listings) >= self._max_results:
+                    return listings
+                listings.append(Listing(
+                    url=item.get("link", ""),
+                    titel=item.get("title") or suchbegriff,
+                    beschreibung=item.get("snippet", ""),
+                    ort=region,
+                    quelle=Quelle.GOOGLE,
+                    datum_gefunden=jetzt,
+                ))
+        return listings
+
+    def _cse_seite(self, query: str, start: int) -> list[dict]:
+        params = {
+            "key": self._api_key,
+            "cx": self._cse_id,
+            "q": query,
+            "start": start,
+            "num": min(CSE_MAX_PRO_SEITE, self._max_results - start + 1),
+            "lr": "lang_de",
+        }
+        timeout = self.scraper_config.get("timeout_sekunden", 30)
+        try:
+            response = self.session.get(CSE_URL, params=params, timeout=timeout)
+            if response.status_code != 200:
+                self.logger.warning("Google CSE HTTP %d (start=%d)", response.status_code, start)
+                return []
+            return response.json().get("items", [])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # Nur den Fehlertyp loggen: der Text enthält die Request-URL samt API-Key
+            self.logger.error("Google CSE fehlgeschlagen: %s", type(e).__name__)
+            return []
@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
 from models import Listing, Quelle
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, elem_text, erstes_element
 
 REGION_PLZ = {
     "Heilbronn": "74072",
@@ -17,16 +17,33 @@ REGION_PLZ = {
     "Sachsenheim": "74343",
 }
 
+# Selektoren einmalig beim Import nach XPath kompilieren
+SEL_ARTIKEL = CSSSelector("article.aditem")
+SEL_ARTIKEL_ALT = CSSSelector("li.ad-listitem article")
+SEL_TITEL = CSSSelector("a.ellipsis, h2.text-module-begin a, [data-testid='ad-title']")
+SEL_BESCHREIBUNG = CSSSelector("p.aditem-main--middle--description, [data-testid='ad-description']")
+SEL_ORT = CSSSelector(".aditem-main--top--left, [data-testid='ad-location']")
+SEL_PREIS = CSSSelector(".aditem-main--middle--price-shipping--price, [data-testid='ad-price']")
+SEL_DATUM = CSSSelector(".aditem-main--top--right, [data-testid='ad-date']")
+
+# Mindestens einer muss im HTML stehen, sonst gibt es nichts zu parsen
+ERGEBNIS_MARKER = (b"aditem", b"ad-listitem")
+
 
 class KleinanzeigenScraper(BaseScraper):
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self._basis_url = config.get("kleinanzeigen", {}).get(
+            "basis_url", "https://www.kleinanzeigen.de"
+        ).rstrip("/")
+
     @property
     def name(self) -> str:
         return "kleinanzeigen"
 
     def _build_url(self, suchbegriff: str, plz: str, radius_km: int = 50) -> str:
-        basis = self.config.get("kleinanzeigen", {}).get("basis_url", "https://www.kleinanzeigen.de")
         encoded = quote_plus(suchbegriff)
-        return f"{basis}/s-{plz}/anzeige:gesuche/{encoded}/k0r{radius_km}"
+        return f"{self._basis_url}/s-{plz}/anzeige:gesuche/{encoded}/k0r{radius_km}"
 
     def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
         plz = REGION_PLZ.get(region, "74072")
@@ -35,51 +52,46 @@ class KleinanzeigenScraper(BaseScraper):
             or self.config.get("kleinanzeigen", {}).get("radius_km", 100)
         )
         url = self._build_url(suchbegriff, plz, radius)
-        response = self._request(url)
-        if not response:
+        root = self._html_laden(url, marker=ERGEBNIS_MARKER)
+        if root is None:
             return []
-        return self._parse_ergebnisse(response.text, suchbegriff)
+        return self._parse_ergebnisse(root, suchbegriff)
 
-    def _parse_ergebnisse(self, html: str, suchbegriff: str) -> list[Listing]:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse_ergebnisse(self, root, suchbegriff: str) -> list[Listing]:
+        jetzt = datetime.now()  # ein Zeitstempel für die ganze Seite
         listings = []
-        for artikel in soup.select("article.aditem") or soup.select("li.ad-listitem article"):
-            listing = self._parse_einzel(artikel)
+        for artikel in SEL_ARTIKEL(root) or SEL_ARTIKEL_ALT(root):
+            listing = self._parse_einzel(artikel, jetzt)
             if listing:
                 listings.append(listing)
-        self.logger.debug(f"Kleinanzeigen: {len(listings)} Listings geparst für '{suchbegriff}'")
+        self.logger.debug("Kleinanzeigen: %d Listings geparst für '%s'", len(listings), suchbegriff)
         return listings
 
-    def _parse_einzel(self, artikel) -> Optional[Listing]:
+    def _parse_einzel(self, artikel, jetzt: datetime) -> Optional[Listing]:
         try:
-            titel_elem = artikel.select_one("a.ellipsis, h2.text-module-begin a, [data-testid='ad-title']")
-            if not titel_elem:
+            titel_elem = erstes_element(artikel, SEL_TITEL)
+            if titel_elem is None:
                 return None
-            titel = titel_elem.get_text(strip=True)
+            titel = elem_text(titel_elem)
             link = titel_elem.get("href", "")
             if link and not link.startswith("http"):
-                basis = self.config.get("kleinanzeigen", {}).get("basis_url", "https://www.kleinanzeigen.de")
-                link = f"{basis}{link}"
+                link = f"{self._basis_url}{link}"
             if not link:
                 return None
-            beschreibung_elem = artikel.select_one("p.aditem-main--middle--description, [data-testid='ad-description']")
-            beschreibung = beschreibung_elem.get_text(strip=True) if beschreibung_elem else ""
-            ort_elem = artikel.select_one(".aditem-main--top--left, [data-testid='ad-location']")
-            ort = ort_elem.get_text(strip=True) if ort_elem else ""
-            preis_elem = artikel.select_one(".aditem-main--middle--price-shipping--price, [data-testid='ad-price']")
-            preis = preis_elem.get_text(strip=True) if preis_elem else None
-            datum_elem = artikel.select_one(".aditem-main--top--right, [data-testid='ad-date']")
-            datum_inserat = datum_elem.get_text(strip=True) if datum_elem else None
+            beschreibung = elem_text(erstes_element(artikel, SEL_BESCHREIBUNG))
+            ort = elem_text(erstes_element(artikel, SEL_ORT))
+            preis = elem_text(erstes_element(artikel, SEL_PREIS)) or None
+            datum_inserat = elem_text(erstes_element(artikel, SEL_DATUM)) or None
             return Listing(
                 url=link,
                 titel=titel,
                 beschreibung=beschreibung,
                 ort=ort,
                 quelle=Quelle.KLEINANZEIGEN,
-                datum_gefunden=datetime.now(),
+                datum_gefunden=jetzt,
                 datum_inserat=datum_inserat,
                 preis=preis,
             )
         except Exception as e:
-            self.logger.debug(f"Fehler beim Parsen eines Listings: {e}")
+            self.logger.debug("Fehler beim Parsen eines Listings: %s", e)
             return None
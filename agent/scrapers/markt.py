@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
 from models import Listing, Quelle
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, elem_text, erstes_element
 
 
 # PLZ für Region (markt.de nutzt oft PLZ oder Stadt)
@@ -17,87 +17,80 @@ REGION_PLZ = {
     "Ludwigsburg": "71638",
 }
 
+# Selektoren einmalig beim Import nach XPath kompilieren
+SEL_ARTIKEL = CSSSelector(
+    "article.ad, .listing-item, .search-result, .aditem, [data-ad-id], .result-item"
+)
+SEL_LINK = CSSSelector("a[href]")
+SEL_TITEL = CSSSelector("h2, h3, .title, .ad-title")
+SEL_BESCHREIBUNG = CSSSelector("p, .description, .content, .ad-description")
+SEL_ORT = CSSSelector(".location, .ort, .place, [data-location]")
+SEL_DATUM = CSSSelector("time, .date, .ad-date")
+SEL_PREIS = CSSSelector(".price, .ad-price")
+
+# Mindestens einer muss im HTML stehen, sonst gibt es nichts zu parsen
+ERGEBNIS_MARKER = (
+    b"<article", b"listing-item", b"search-result", b"aditem", b"data-ad-id", b"result-item",
+)
+
 
 class MarktScraper(BaseScraper):
     """Durchsucht markt.de nach Handwerks-Gesuchen."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self._basis_url = config.get("markt", {}).get(
+            "basis_url", "https://www.markt.de"
+        ).rstrip("/")
+
     @property
     def name(self) -> str:
         return "markt"
 
     def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
         """Sucht auf markt.de. Gibt Liste von Listing zurück."""
-        basis = self.config.get("markt", {}).get(
-            "basis_url", "https://www.markt.de"
-        )
         plz = REGION_PLZ.get(region, "74072")
         radius = self.config.get("markt", {}).get("radius_km", 100)
         encoded = quote_plus(suchbegriff)
         # Typische markt.de Such-URL (ggf. an echte Struktur anpassen)
-        url = f"{basis}/kleinanzeigen/suche?q={encoded}&plz={plz}&radius={radius}"
+        url = f"{self._basis_url}/kleinanzeigen/suche?q={encoded}&plz={plz}&radius={radius}"
 
-        response = self._request(url)
-        if not response:
+        root = self._html_laden(url, marker=ERGEBNIS_MARKER)
+        if root is None:
             return []
 
-        return self._parse_ergebnisse(response.text, suchbegriff)
+        return self._parse_ergebnisse(root, suchbegriff)
 
-    def _parse_ergebnisse(self, html: str, suchbegriff: str) -> list[Listing]:
+    def _parse_ergebnisse(self, root, suchbegriff: str) -> list[Listing]:
         """HTML parsen, Liste von Listing-Objekten bauen."""
-        soup = BeautifulSoup(html, "html.parser")
+        jetzt = datetime.now()  # ein Zeitstempel für die ganze Seite
         listings = []
-
-        for elem in soup.select(
-            "article.ad, .listing-item, .search-result, "
-            ".aditem, [data-ad-id], .result-item"
-        ):
-            listing = self._parse_einzel(elem)
+        for elem in SEL_ARTIKEL(root):
+            listing = self._parse_einzel(elem, jetzt)
             if listing:
                 listings.append(listing)
-
-        self.logger.debug(
-            f"markt: {len(listings)} Listings für '{suchbegriff}'"
-        )
+        self.logger.debug("markt: %d Listings für '%s'", len(listings), suchbegriff)
         return listings
 
-    def _parse_einzel(self, elem) -> Optional[Listing]:
+    def _parse_einzel(self, elem, jetzt: datetime) -> Optional[Listing]:
         """Ein Suchergebnis in ein Listing umwandeln."""
         try:
-            link = elem.select_one("a[href]")
-            if not link:
+            link = erstes_element(elem, SEL_LINK)
+            if link is None:
                 return None
             href = link.get("href", "")
             if href and not href.startswith("http"):
-                basis = self.config.get("markt", {}).get(
-                    "basis_url", "https://www.markt.de"
-                )
-                href = f"{basis.rstrip('/')}{href}"
-            titel = link.get_text(strip=True) if link else ""
-            if not titel:
-                titel = elem.select_one("h2, h3, .title, .ad-title")
-                titel = titel.get_text(strip=True) if titel else "Ohne Titel"
-
-            beschreibung = ""
-            desc = elem.select_one("p, .description, .content, .ad-description")
-            if desc:
-                beschreibung = desc.get_text(strip=True)[:2000]
-
-            ort = ""
-            loc = elem.select_one(".location, .ort, .place, [data-location]")
-            if loc:
-                ort = loc.get_text(strip=True)
+                href = f"{self._basis_url}{href}"
+            titel = elem_text(link) or elem_text(erstes_element(elem, SEL_TITEL))
+            beschreibung = elem_text(erstes_element(elem, SEL_BESCHREIBUNG))[:2000]
+            ort = elem_text(erstes_element(elem, SEL_ORT))
 
             datum_inserat = None
-            date_elem = elem.select_one("time, .date, .ad-date")
-            if date_elem:
-                datum_inserat = date_elem.get_text(strip=True)
-            if date_elem and date_elem.get("datetime"):
-                datum_inserat = date_elem.get("datetime")
+            date_elem = erstes_element(elem, SEL_DATUM)
+            if date_elem is not None:
+                datum_inserat = date_elem.get("datetime") or elem_text(date_elem)
 
-            preis = None
-            price_elem = elem.select_one(".price, .ad-price")
-            if price_elem:
-                preis = price_elem.get_text(strip=True)
+            preis = elem_text(erstes_element(elem, SEL_PREIS)) or None
 
             return Listing(
                 url=href,
@@ -105,10 +98,10 @@ class MarktScraper(BaseScraper):
                 beschreibung=beschreibung,
                 ort=ort,
                 quelle=Quelle.MARKT,
-                datum_gefunden=datetime.now(),
+                datum_gefunden=jetzt,
                 datum_inserat=datum_inserat,
                 preis=preis,
             )
         except Exception as e:
-            self.logger.debug(f"markt Parse-Fehler: {e}")
+            self.logger.debug("markt Parse-Fehler: %s", e)
             return None
@@ -7,6 +7,8 @@ from scrapers.base import BaseScraper
 
 
 class MyHammerScraper(BaseScraper):
+    implementiert = False
+
     @property
     def name(self) -> str:
         return "myhammer"
@@ -4,86 +4,76 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
 from models import Listing, Quelle
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, elem_text, erstes_element
+
+# Selektoren einmalig beim Import nach XPath kompilieren.
+# nebenan.de nutzt verschiedene Strukturen – typische Container: .post, .request-card, [data-testid="request-item"]
+SEL_ARTIKEL = CSSSelector(
+    "article.post, .request-card, [data-testid='request-item'], "
+    ".gesuch-item, .search-result-item"
+)
+SEL_LINK = CSSSelector("a[href*='/gesuche/'], a[href*='/request/'], a[href]")
+SEL_TITEL = CSSSelector("h2, h3, .title")
+SEL_BESCHREIBUNG = CSSSelector("p, .description, .content, .text")
+SEL_ORT = CSSSelector("[data-location], .location, .ort, .place")
+SEL_DATUM = CSSSelector("time, .date, .time")
 
 
 class NebenanScraper(BaseScraper):
     """Durchsucht nebenan.de nach Handwerks-Gesuchen in der Region."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self._basis_url = config.get("nebenan", {}).get(
+            "basis_url", "https://www.nebenan.de"
+        ).rstrip("/")
+
     @property
     def name(self) -> str:
         return "nebenan"
 
     def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
         """Sucht auf nebenan.de. Gibt Liste von Listing zurück."""
-        basis = self.config.get("nebenan", {}).get(
-            "basis_url", "https://www.nebenan.de"
-        )
         # Such-URL (nebenan.de Struktur kann sich ändern – ggf. anpassen)
-        url = f"{basis}/gesuche?query={quote_plus(suchbegriff)}&location={quote_plus(region)}"
+        url = f"{self._basis_url}/gesuche?query={quote_plus(suchbegriff)}&location={quote_plus(region)}"
 
-        response = self._request(url)
-        if not response:
+        root = self._html_laden(url)
+        if root is None:
             return []
 
-        return self._parse_ergebnisse(response.text, suchbegriff)
+        return self._parse_ergebnisse(root, suchbegriff)
 
-    def _parse_ergebnisse(self, html: str, suchbegriff: str) -> list[Listing]:
+    def _parse_ergebnisse(self, root, suchbegriff: str) -> list[Listing]:
         """HTML parsen, Liste von Listing-Objekten bauen."""
-        soup = BeautifulSoup(html, "html.parser")
+        jetzt = datetime.now()  # ein Zeitstempel für die ganze Seite
         listings = []
-
-        # Selektoren anpassen – nebenan.de nutzt verschiedene Strukturen
-        # Typische Container: .post, .request-card, [data-testid="request-item"]
-        for elem in soup.select(
-            "article.post, .request-card, [data-testid='request-item'], "
-            ".gesuch-item, .search-result-item"
-        ):
-            listing = self._parse_einzel(elem)
+        for elem in SEL_ARTIKEL(root):
+            listing = self._parse_einzel(elem, jetzt)
             if listing:
                 listings.append(listing)
-
-        self.logger.debug(
-            f"nebenan: {len(listings)} Listings für '{suchbegriff}'"
-        )
+        self.logger.debug("nebenan: %d Listings für '%s'", len(listings), suchbegriff)
         return listings
 
-    def _parse_einzel(self, elem) -> Optional[Listing]:
+    def _parse_einzel(self, elem, jetzt: datetime) -> Optional[Listing]:
         """Ein Suchergebnis in ein Listing umwandeln."""
         try:
-            link = elem.select_one("a[href*='/gesuche/'], a[href*='/request/'], a[href]")
-            if not link:
+            link = erstes_element(elem, SEL_LINK)
+            if link is None:
                 return None
             href = link.get("href", "")
             if href and not href.startswith("http"):
-                basis = self.config.get("nebenan", {}).get(
-                    "basis_url", "https://www.nebenan.de"
-                )
-                href = f"{basis.rstrip('/')}{href}"
-            titel = link.get_text(strip=True) if link else ""
-            if not titel:
-                titel = elem.select_one("h2, h3, .title")
-                titel = titel.get_text(strip=True) if titel else "Ohne Titel"
-
-            beschreibung = ""
-            desc = elem.select_one("p, .description, .content, .text")
-            if desc:
-                beschreibung = desc.get_text(strip=True)[:2000]
-
-            ort = ""
-            loc = elem.select_one("[data-location], .location, .ort, .place")
-            if loc:
-                ort = loc.get_text(strip=True)
+                href = f"{self._basis_url}{href}"
+            titel = elem_text(link) or elem_text(erstes_element(elem, SEL_TITEL))
+            beschreibung = elem_text(erstes_element(elem, SEL_BESCHREIBUNG))[:2000]
+            ort = elem_text(erstes_element(elem, SEL_ORT))
 
             datum_inserat = None
-            date_elem = elem.select_one("time, .date, .time")
-            if date_elem:
-                datum_inserat = date_elem.get_text(strip=True)
-            if date_elem and date_elem.get("datetime"):
-                datum_inserat = date_elem.get("datetime")
+            date_elem = erstes_element(elem, SEL_DATUM)
+            if date_elem is not None:
+                datum_inserat = date_elem.get("datetime") or elem_text(date_elem)
 
             return Listing(
                 url=href,
@@ -91,9 +81,9 @@ class NebenanScraper(BaseScraper):
                 beschreibung=beschreibung,
                 ort=ort,
                 quelle=Quelle.NEBENAN,
-                datum_gefunden=datetime.now(),
+                datum_gefunden=jetzt,
                 datum_inserat=datum_inserat,
             )
         except Exception as e:
-            self.logger.debug(f"nebenan Parse-Fehler: {e}")
+            self.logger.debug("nebenan Parse-Fehler: %s", e)
             return None
@@ -2,55 +2,116 @@
 
 import re
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
 from models import Listing
 
+# Alle Datumsformen in einer Alternation – ein Scan statt mehrerer re.search-Aufrufe
+_RE_DATUMSANGABE = re.compile(
+    r"(?P<stunden>vor\s+(?P<h>\d+)\s*(?:std\.?|stunden?))"
+    r"|(?P<heute>heute)"
+    r"|(?P<gestern>gestern)"
+    r"|(?P<datum>(?P<d>\d{1,2})\.(?P<mo>\d{1,2})\.(?P<y>\d{2,4}))",
+    re.I,
+)
+_RE_UHRZEIT = re.compile(r"(\d{1,2})\s*:\s*(\d{2})")
 
-def parse_inserat_datum(text: Optional[str]) -> Optional[datetime]:
+# Vorrang bei mehreren Treffern im selben Text (kleiner = wichtiger)
+_VORRANG = {"stunden": 0, "heute": 1, "gestern": 2, "datum": 3}
+
+
+@lru_cache(maxsize=4096)
+def _datumsangabe_zerlegen(text: str) -> Optional[tuple]:
+    """Regex-Teil von parse_inserat_datum: zeitunabhängig und daher cachebar.
+
+    Liefert ("stunden", h), ("heute"|"gestern", [h, mi]) oder ("datum", y, mo, d).
+    """
+    treffer = None
+    for m in _RE_DATUMSANGABE.finditer(text):
+        if treffer is None or _VORRANG[m.lastgroup] < _VORRANG[treffer.lastgroup]:
+            treffer = m
+            if m.lastgroup == "stunden":
+                break
+    if treffer is None:
+        return None
+
+    art = treffer.lastgroup
+    if art == "stunden":
+        return (art, int(treffer.group("h")))
+    if art in ("heute", "gestern"):
+        m = _RE_UHRZEIT.search(text)
+        return (art, int(m.group(1)), int(m.group(2))) if m else (art,)
+
+    y = int(treffer.group("y"))
+    if y < 100:
+        y += 2000
+    return (art, y, int(treffer.group("mo")), int(treffer.group("d")))
+
+
+def parse_inserat_datum(text: Optional[str], now: Optional[datetime] = None) -> Optional[datetime]:
     if not text or not isinstance(text, str):
         return None
-    text = text.strip()
-    now = datetime.now()
-
-    m = re.search(r"vor\s+(\d+)\s*(?:std\.?|stunden?)", text, re.I)
-    if m:
-        stunden = int(m.group(1))
-        return now - timedelta(hours=stunden)
-
-    if re.search(r"heute", text, re.I):
-        m = re.search(r"(\d{1,2})\s*:\s*(\d{2})", text)
-        if m:
-            h, mi = int(m.group(1)), int(m.group(2))
-            return now.replace(hour=h, minute=mi, second=0, microsecond=0)
+    angabe = _datumsangabe_zerlegen(text.strip())
+    if angabe is None:
+        return None
+
+    # Relative Angaben immer gegen die aktuelle Zeit auflösen (nicht mitcachen)
+    art = angabe[0]
+    now = now or datetime.now()
+
+    if art == "stunden":
+        return now - timedelta(hours=angabe[1])
+
+    if art == "heute":
+        if len(angabe) == 3:
+            return now.replace(hour=angabe[1], minute=angabe[2], second=0, microsecond=0)
         return now
 
-    if re.search(r"gestern", text, re.I):
-        m = re.search(r"(\d{1,2})\s*:\s*(\d{2})", text)
+    if art == "gestern":
         gestern = now - timedelta(days=1)
-        if m:
-            h, mi = int(m.group(1)), int(m.group(2))
-            return gestern.replace(hour=h, minute=mi, second=0, microsecond=0)
+        if len(angabe) == 3:
+            return gestern.replace(hour=angabe[1], minute=angabe[2], second=0, microsecond=0)
         return gestern.replace(hour=12, minute=0, second=0, microsecond=0)
 
-    m = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})", text)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        if y < 100:
-            y += 2000
-        try:
-            return datetime(y, mo, d, 12, 0, 0)
-        except ValueError:
-            return None
-
-    return None
+    y, mo, d = angabe[1:]
+    try:
+        return datetime(y, mo, d, 12, 0, 0)
+    except ValueError:
+        return None
 
 
-def ist_nicht_aelter_als_stunden(listing: Listing, max_stunden: int) -> bool:
+def ist_nicht_aelter_als_stunden(
+    listing: Listing, max_stunden: int, now: Optional[datetime] = None
+) -> bool:
     if max_stunden <= 0:
         return True
-    parsed = parse_inserat_datum(listing.datum_inserat)
+    now = now or datetime.now()
+    parsed = parse_inserat_datum(listing.datum_inserat, now)
     if parsed is None:
         return False
-    grenze = datetime.now() - timedelta(hours=max_stunden)
-    return parsed >= grenze
+    return parsed >= now - timedelta(hours=max_stunden)
+
+
+def alter_pruefer(max_stunden: int, now: Optional[datetime] = None) -> Callable[[Listing], bool]:
+    """Prädikat "nicht älter als max_stunden" mit einem festen Zeitpunkt für viele Listings."""
+    if max_stunden <= 0:
+        return lambda listing: True
+    now = now or datetime.now()
+    grenze = now - timedelta(hours=max_stunden)
+
+    def pruefen(listing: Listing) -> bool:
+        text = listing.datum_inserat
+        angabe = _datumsangabe_zerlegen(text.strip()) if text and isinstance(text, str) else None
+        if angabe is None:
+            return False
+        # "vor N Std." / "heute" ohne Uhrzeit: direkt vergleichen, ohne datetime zu bauen
+        if angabe[0] == "stunden":
+            return angabe[1] <= max_stunden
+        if angabe == ("heute",):
+            return True
+        parsed = parse_inserat_datum(text, now)
+        return parsed is not None and parsed >= grenze
+
+    return pruefen
+
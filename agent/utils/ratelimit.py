@@ -0,0 +1,33 @@
+"""Token-Bucket-Rate-Limiter für ausgehende API-Aufrufe."""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Erlaubt im Mittel `rate` Aufrufe pro Sekunde, Bursts bis `kapazitaet`.
+
+    Gewartet wird nur in `warten()` direkt vor dem Aufruf – Arbeit zwischen
+    zwei Aufrufen füllt den Eimer bereits wieder auf. rate <= 0 = unbegrenzt.
+    """
+
+    def __init__(self, rate: float, kapazitaet: int = 1):
+        self.rate = rate
+        self.kapazitaet = kapazitaet
+        self._tokens = float(kapazitaet)
+        self._zuletzt = time.monotonic()
+        self._lock = threading.Lock()
+
+    def warten(self) -> None:
+        """Blockiert, bis ein Token verfügbar ist, und verbraucht es."""
+        if self.rate <= 0:
+            return
+        with self._lock:
+            jetzt = time.monotonic()
+            self._tokens = min(self.kapazitaet, self._tokens + (jetzt - self._zuletzt) * self.rate)
+            self._zuletzt = jetzt
+            if self._tokens < 1:
+                time.sleep((1 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._zuletzt = time.monotonic()
+            self._tokens -= 1
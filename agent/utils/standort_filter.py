@@ -6,29 +6,50 @@ from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.standort_filter")
 
+_RE_PLZ = re.compile(r'\b(\d{5})\b')
+
 # PLZ-Präfixe für das Einzugsgebiet (100 km um Heilbronn)
 # Heilbronn: 74xxx
 # Stuttgart: 70xxx, 71xxx
 # Heidelberg/Mannheim: 69xxx
 # Würzburg: 97xxx (teilweise)
 # Schwäbisch Hall: 74xxx
-ERLAUBTE_PLZ_PREFIXES = [
+ERLAUBTE_PLZ_PREFIXES = (
     "74",   # Heilbronn, Schwäbisch Hall, Crailsheim, Öhringen
     "70",   # Stuttgart
     "71",   # Ludwigsburg, Backnang
     "72",   # Tübingen, Reutlingen
     "69",   # Heidelberg, Mannheim
     "73",   # Göppingen, Aalen
-]
+)
 
 # Ortsnamen die immer akzeptiert werden
-ERLAUBTE_ORTSKEYWORDS = [
+ERLAUBTE_ORTSKEYWORDS = (
     "heilbronn", "neckarsulm", "weinsberg", "bad friedrichshall", "lauffen",
     "brackenheim", "öhringen", "neuenstadt", "eppingen", "gemmrigheim",
     "besigheim", "bietigheim", "ludwigsburg", "stuttgart", "heidelberg",
     "mannheim", "schwäbisch hall", "crailsheim", "künzelsau", "würzburg",
-    "mosbach", "sinsheim", "heilbronn", "neckargemünd", "eppingen",
-]
+    "mosbach", "sinsheim", "neckargemünd",
+)
+# "Enthält irgendeinen Ortsnamen" in einem Scan; der Treffer ist der erkannte Ort
+_RE_ORTSKEYWORDS = re.compile("|".join(re.escape(k) for k in ERLAUBTE_ORTSKEYWORDS))
+
+# (regionen-Dict, Index) – die Config-Regionen ändern sich zur Laufzeit nicht
+_regionen_cache: tuple = (None, ())
+
+
+def _regionen_index(regionen: dict) -> tuple:
+    """Flacht die Config-Regionen einmal ab: (Suchtext, gegen_kleinschreibung, Grund)."""
+    global _regionen_cache
+    if _regionen_cache[0] is not regionen:
+        index = []
+        for region_data in regionen.values():
+            for keyword in region_data.get("keywords", []):
+                index.append((keyword.lower(), True, f"Region '{keyword}' erkannt"))
+            for prefix in region_data.get("plz_prefixes", []):
+                index.append((prefix, False, f"PLZ-Präfix '{prefix}' erkannt"))
+        _regionen_cache = (regionen, tuple(index))
+    return _regionen_cache[1]
 
 
 def ist_im_einzugsgebiet(listing: Listing, config: dict) -> tuple[bool, str]:
@@ -51,30 +72,22 @@ def ist_im_einzugsgebiet(listing: Listing, config: dict) -> tuple[bool, str]:
     ort_lower = ort.lower()
 
     # 1. Prüfe PLZ im Ortsstring
-    plz_match = re.search(r'\b(\d{5})\b', ort)
+    plz_match = _RE_PLZ.search(ort)
     if plz_match:
         plz = plz_match.group(1)
-        for prefix in ERLAUBTE_PLZ_PREFIXES:
-            if plz.startswith(prefix):
-                return True, f"PLZ {plz} im Einzugsgebiet"
+        if plz.startswith(ERLAUBTE_PLZ_PREFIXES):
+            return True, f"PLZ {plz} im Einzugsgebiet"
 
     # 2. Prüfe Ortsnamen
-    for keyword in ERLAUBTE_ORTSKEYWORDS:
-        if keyword in ort_lower:
-            return True, f"Ort '{keyword}' erkannt"
+    treffer = _RE_ORTSKEYWORDS.search(ort_lower)
+    if treffer:
+        return True, f"Ort '{treffer.group(0)}' erkannt"
 
     # 3. Prüfe Regions-Keywords aus Config
-    regionen = config.get("regionen", {})
-    for region_name, region_data in regionen.items():
-        keywords = region_data.get("keywords", [])
-        for keyword in keywords:
-            if keyword.lower() in ort_lower:
-                return True, f"Region '{keyword}' erkannt"
-        plz_prefixes = region_data.get("plz_prefixes", [])
-        for prefix in plz_prefixes:
-            if prefix in ort:
-                return True, f"PLZ-Präfix '{prefix}' erkannt"
+    for suchtext, klein, grund in _regionen_index(config.get("regionen", {})):
+        if suchtext in (ort_lower if klein else ort):
+            return True, grund
 
     # Nicht im Einzugsgebiet
-    logger.debug(f"Standort außerhalb: {ort}")
+    logger.debug("Standort außerhalb: %s", ort)
     return False, f"Standort '{ort}' außerhalb des Einzugsgebiets"
@@ -34,7 +34,8 @@ from scrapers.kleinanzeigen import KleinanzeigenScraper
 from scrapers.myhammer import MyHammerScraper
 from scrapers.google_search import GoogleScraper
 from scrapers.facebook import FacebookScraper
-from utils.date_parser import ist_nicht_aelter_als_stunden
+from utils.async_loop import ausfuehren
+from utils.date_parser import alter_pruefer
 from utils.logger import setup_logger
 
 # .env laden
@@ -121,6 +122,7 @@ class AkquiseAgent:
         regionen = self._get_regionen()
         neue_ergebnisse = 0
         fehler = 0
+        zu_senden: list[Bewertungsergebnis] = []
 
         for scraper in self.scrapers:
             try:
@@ -131,23 +133,21 @@ class AkquiseAgent:
                 relevante_begriffe = suchbegriffe[:8]
                 relevante_regionen = regionen[:3]
 
-                listings = scraper.alle_suchen(relevante_begriffe, relevante_regionen)
-
                 # Nur Anzeigen nicht älter als X Stunden (z. B. 5)
                 max_alter = (
                     self.config.get("suchgebiet", {}).get("max_alter_stunden")
                     or 0
                 )
-                if max_alter > 0:
-                    vorher = len(listings)
-                    listings = [l for l in listings if ist_nicht_aelter_als_stunden(l, max_alter)]
-                    if vorher > len(listings):
-                        logger.info(
-                            f"Alter-Filter: {vorher - len(listings)} Anzeigen "
-                            f"älter als {max_alter}h entfernt, {len(listings)} übrig"
-                        )
+                zu_alt = 0
+                # Grenze einmal pro Scraper berechnen statt pro Listing
+                ist_frisch = alter_pruefer(max_alter)
+
+                # alle_suchen ist ein Generator – Bewertung startet mit dem ersten Treffer
+                for listing in scraper.alle_suchen(relevante_begriffe, relevante_regionen):
+                    if not ist_frisch(listing):
+                        zu_alt += 1
+                        continue
 
-                for listing in listings:
                     # Deduplizierung gegen DB
                     if self.db.existiert(listing.url_hash):
                         continue
@@ -175,17 +175,26 @@ class AkquiseAgent:
                         antwort_vorschlag=ergebnis.antwort_vorschlag or "",
                     )
 
-                    # Telegram-Benachrichtigung (nur grün und gelb)
+                    # Telegram-Benachrichtigung (nur grün und gelb), gesammelt am Ende
                     if ergebnis.ist_relevant:
-                        self.telegram.senden_sync(ergebnis)
+                        zu_senden.append(ergebnis)
                         neue_ergebnisse += 1
-                        # Telegram Rate-Limit: max 1 Nachricht pro Sekunde
-                        time.sleep(1.5)
+
+                if zu_alt:
+                    logger.info(
+                        f"Alter-Filter: {zu_alt} Anzeigen älter als {max_alter}h entfernt"
+                    )
 
             except Exception as e:
                 logger.error(f"Fehler bei Scraper {scraper.name}: {e}")
                 fehler += 1
 
+        # Alle Benachrichtigungen auf einmal – senden_alle hält das Rate-Limit ein
+        try:
+            self.telegram.senden_alle_sync(zu_senden)
+        except Exception as e:
+            logger.error(f"Telegram-Versand fehlgeschlagen: {e}")
+
         logger.info(
             f"Durchlauf beendet: {neue_ergebnisse} neue relevante Ergebnisse, "
             f"{fehler} Fehler"
@@ -193,13 +202,10 @@ class AkquiseAgent:
 
         # Bei Fehlern Telegram benachrichtigen
         if fehler > 0:
-            import asyncio
             try:
-                asyncio.run(
-                    self.telegram.fehler_melden(
-                        f"Durchlauf hatte {fehler} Scraper-Fehler. "
-                        f"Details im Log."
-                    )
+                self.telegram.fehler_melden_sync(
+                    f"Durchlauf hatte {fehler} Scraper-Fehler. "
+                    f"Details im Log."
                 )
             except Exception:
                 pass
@@ -219,7 +225,7 @@ class AkquiseAgent:
 
         if einmal:
             logger.info("Einmal-Modus: Beende nach erstem Durchlauf.")
-            self.db.close()
+            self._beenden()
             return
 
         # Scheduler konfigurieren
@@ -257,13 +263,21 @@ class AkquiseAgent:
             time.sleep(1)
 
         logger.info("Agent beendet.")
+        self._beenden()
+
+    def _beenden(self):
+        """Gibt Browser/Playwright-Treiber des Facebook-Scrapers und die DB frei."""
+        for scraper in self.scrapers:
+            if isinstance(scraper, FacebookScraper):
+                try:
+                    ausfuehren(scraper.close())
+                except Exception as e:
+                    logger.warning(f"Facebook-Browser nicht sauber geschlossen: {e}")
         self.db.close()
 
 
 def test_telegram(config_pfad: str = "config.yaml"):
     """Sendet eine Test-Nachricht an Telegram."""
-    import asyncio
-
     config_path = ROOT / config_pfad
     with open(config_path, "r", encoding="utf-8") as f:
         config = yaml.safe_load(f)
@@ -285,7 +299,7 @@ def test_telegram(config_pfad: str = "config.yaml"):
         else:
             print("FEHLER: Bot nicht initialisiert. Token prüfen!")
 
-    asyncio.run(_test())
+    ausfuehren(_test())
 
 
 def main():
@@ -1,5 +1,6 @@
 """Datenmodelle für SE Handwerk Akquise-Agent."""
 
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -33,7 +34,7 @@ class Status(Enum):
     UEBERSPRUNGEN = "uebersprungen"
 
 
-@dataclass
+@dataclass(slots=True)
 class Listing:
     """Ein gefundenes Inserat/Gesuch von einer Plattform."""
     url: str
@@ -50,11 +51,10 @@ class Listing:
     @property
     def url_hash(self) -> str:
         """Eindeutiger Hash der URL für Deduplizierung."""
-        import hashlib
         return hashlib.md5(self.url.encode()).hexdigest()
 
 
-@dataclass
+@dataclass(slots=True)
 class Bewertungsergebnis:
     """Ergebnis der Bewertung eines Listings."""
     listing: Listing
@@ -1,6 +1,7 @@
 """Telegram Bot für Benachrichtigungen über neue Aufträge."""
 
 import asyncio
+import html
 import os
 from typing import Optional
 
@@ -10,12 +11,50 @@ from telegram.ext import (
     CallbackQueryHandler,
     ContextTypes,
 )
+from telegram.request import HTTPXRequest
 
-from models import Bewertungsergebnis, Prioritaet
+from models import Bewertungsergebnis, Kategorie, Prioritaet, Quelle
+from utils.async_loop import ausfuehren
 from utils.logger import setup_logger
 
 logger = setup_logger("se_handwerk.telegram")
 
+PRIO_EMOJI = {Prioritaet.GRUEN: "🟢", Prioritaet.GELB: "🟡", Prioritaet.ROT: "🔴"}
+
+KATEGORIE_LABELS = {
+    Kategorie.BODEN: "Bodenarbeiten",
+    Kategorie.MONTAGE: "Montage",
+    Kategorie.UEBERGABE: "Übergabe/Renovierung",
+    Kategorie.SONSTIGES: "Sonstiges",
+}
+
+QUELLE_LABELS = {
+    Quelle.KLEINANZEIGEN: "Kleinanzeigen",
+    Quelle.MYHAMMER: "MyHammer",
+    Quelle.GOOGLE: "Google",
+    Quelle.FACEBOOK: "Facebook",
+}
+
+ZUSAMMENFASSUNG_KOPF = (
+    "<b>📊 Tages-Zusammenfassung SE Handwerk</b>\n"
+    "━━━━━━━━━━━━━━━━━━━\n\n"
+    "📋 Gefunden: <b>{gesamt}</b> Listings\n"
+    "🟢 Hoch: <b>{gruen}</b>\n"
+    "🟡 Mittel: <b>{gelb}</b>\n"
+    "🔴 Niedrig: <b>{rot}</b>\n"
+    "✅ Beantwortet: <b>{beantwortet}</b>\n"
+)
+TOP_EMOJI = ("🥇", "🥈", "🥉")
+
+FEHLER_KOPF = "⚠️ <b>SE Handwerk Agent - Fehler</b>\n\n"
+
+# (Label, callback_data-Präfix) der Callback-Buttons; dazu kommt der URL-Button "Öffnen"
+CALLBACK_BUTTONS = (
+    ("✅ Antwort kopieren", "copy"),
+    ("📋 Details", "details"),
+    ("❌ Überspringen", "skip"),
+)
+
 
 class TelegramNotifier:
     """Sendet Auftrags-Benachrichtigungen per Telegram."""
@@ -31,7 +70,12 @@ class TelegramNotifier:
         if not self.token or self.token == "DEIN_BOT_TOKEN_HIER":
             logger.warning("Telegram Bot Token nicht konfiguriert!")
         else:
-            self.bot = Bot(token=self.token)
+            # Mehrere Verbindungen, damit die gestaffelten Sends aus senden_alle
+            # nicht auf die eine Standard-Verbindung (PTB 20.x) warten
+            request = HTTPXRequest(
+                connection_pool_size=8, connect_timeout=5.0, read_timeout=10.0
+            )
+            self.bot = Bot(token=self.token, request=request)
 
     def set_callback_handler(self, handler: callable):
         """Setzt den Handler für Button-Callbacks."""
@@ -62,28 +106,36 @@ class TelegramNotifier:
             logger.error(f"Telegram Fehler: {e}")
             return False
 
+    async def senden_alle(self, ergebnisse: list[Bewertungsergebnis]) -> int:
+        """Sendet mehrere Benachrichtigungen nebenläufig, gestaffelt nach Telegram-Limit."""
+        max_pro_sekunde = self.config.get("telegram", {}).get("max_pro_sekunde", 1)
+        # 0 (oder kleiner) = ohne Staffelung senden
+        abstand = 1 / max_pro_sekunde if max_pro_sekunde > 0 else 0.0
+
+        async def _gestaffelt(i: int, ergebnis: Bewertungsergebnis) -> bool:
+            # Startzeitpunkte im festen Abstand – die Netzwerk-Latenz überlappt
+            await asyncio.sleep(i * abstand)
+            return await self.senden(ergebnis)
+
+        gesendet = await asyncio.gather(
+            *(_gestaffelt(i, e) for i, e in enumerate(ergebnisse))
+        )
+        return sum(gesendet)
+
     async def tages_zusammenfassung(self, statistik: dict, top_listings: list[dict]):
         """Sendet die tägliche Zusammenfassung."""
         if not self.bot:
             return
 
-        text = (
-            "<b>📊 Tages-Zusammenfassung SE Handwerk</b>\n"
-            "━━━━━━━━━━━━━━━━━━━\n\n"
-            f"📋 Gefunden: <b>{statistik['gesamt']}</b> Listings\n"
-            f"🟢 Hoch: <b>{statistik['gruen']}</b>\n"
-            f"🟡 Mittel: <b>{statistik['gelb']}</b>\n"
-            f"🔴 Niedrig: <b>{statistik['rot']}</b>\n"
-            f"✅ Beantwortet: <b>{statistik['beantwortet']}</b>\n"
-        )
+        text = ZUSAMMENFASSUNG_KOPF.format(**statistik)
 
         if top_listings:
             text += "\n<b>🏆 Top 3 Aufträge heute:</b>\n"
-            for i, listing in enumerate(top_listings, 1):
-                emoji = ["🥇", "🥈", "🥉"][i - 1] if i <= 3 else "•"
+            for i, listing in enumerate(top_listings):
+                emoji = TOP_EMOJI[i] if i < len(TOP_EMOJI) else "•"
                 text += (
-                    f"\n{emoji} <b>{listing['titel'][:50]}</b>\n"
-                    f"   📍 {listing['ort']} | Score: {listing['score']}\n"
+                    f"\n{emoji} <b>{html.escape(listing['titel'][:50])}</b>\n"
+                    f"   📍 {html.escape(listing['ort'])} | Score: {listing['score']}\n"
                     f"   🔗 {listing['url']}\n"
                 )
 
@@ -103,7 +155,8 @@ class TelegramNotifier:
         if not self.bot:
             return
 
-        text = f"⚠️ <b>SE Handwerk Agent - Fehler</b>\n\n{nachricht}"
+        # Fehlertexte enthalten oft "<" oder "&" (Exceptions) – sonst lehnt Telegram das HTML ab
+        text = FEHLER_KOPF + html.escape(nachricht)
 
         try:
             await self.bot.send_message(
@@ -118,31 +171,9 @@ class TelegramNotifier:
         """Formatiert die Benachrichtigung."""
         listing = ergebnis.listing
 
-        # Prioritäts-Emoji
-        prio_map = {
-            Prioritaet.GRUEN: "🟢",
-            Prioritaet.GELB: "🟡",
-            Prioritaet.ROT: "🔴",
-        }
-        prio_emoji = prio_map.get(ergebnis.prioritaet, "⚪")
-
-        # Kategorie-Label
-        kat_labels = {
-            "boden": "Bodenarbeiten",
-            "montage": "Montage",
-            "uebergabe": "Übergabe/Renovierung",
-            "sonstiges": "Sonstiges",
-        }
-        kat_label = kat_labels.get(ergebnis.kategorie.value, "Sonstiges")
-
-        # Quelle
-        quelle_labels = {
-            "kleinanzeigen": "Kleinanzeigen",
-            "myhammer": "MyHammer",
-            "google": "Google",
-            "facebook": "Facebook",
-        }
-        quelle = quelle_labels.get(listing.quelle.value, listing.quelle.value)
+        prio_emoji = PRIO_EMOJI.get(ergebnis.prioritaet, "⚪")
+        kat_label = KATEGORIE_LABELS.get(ergebnis.kategorie, "Sonstiges")
+        quelle = QUELLE_LABELS.get(listing.quelle, listing.quelle.value)
 
         text = (
             f"{prio_emoji} <b>NEUER AUFTRAG</b> (Score: {ergebnis.score_gesamt}/100)\n"
@@ -183,55 +214,29 @@ class TelegramNotifier:
     ) -> InlineKeyboardMarkup:
         """Erstellt Inline-Buttons unter der Nachricht."""
         url_hash = ergebnis.listing.url_hash
-
         buttons = [
-            [
-                InlineKeyboardButton(
-                    "✅ Antwort kopieren",
-                    callback_data=f"copy:{url_hash}",
-                ),
-                InlineKeyboardButton(
-                    "📋 Details",
-                    callback_data=f"details:{url_hash}",
-                ),
-            ],
-            [
-                InlineKeyboardButton(
-                    "❌ Überspringen",
-                    callback_data=f"skip:{url_hash}",
-                ),
-                InlineKeyboardButton(
-                    "🔗 Öffnen",
-                    url=ergebnis.listing.url,
-                ),
-            ],
+            InlineKeyboardButton(label, callback_data=f"{praefix}:{url_hash}")
+            for label, praefix in CALLBACK_BUTTONS
         ]
+        buttons.append(InlineKeyboardButton("🔗 Öffnen", url=ergebnis.listing.url))
 
-        return InlineKeyboardMarkup(buttons)
+        # Zwei Zeilen à zwei Buttons
+        return InlineKeyboardMarkup([buttons[:2], buttons[2:]])
 
     def senden_sync(self, ergebnis: Bewertungsergebnis) -> bool:
         """Synchroner Wrapper für senden()."""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Wenn bereits ein Event-Loop läuft
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as pool:
-                    return pool.submit(
-                        asyncio.run, self.senden(ergebnis)
-                    ).result()
-            else:
-                return loop.run_until_complete(self.senden(ergebnis))
-        except RuntimeError:
-            return asyncio.run(self.senden(ergebnis))
+        return ausfuehren(self.senden(ergebnis))
+
+    def senden_alle_sync(self, ergebnisse: list[Bewertungsergebnis]) -> int:
+        """Synchroner Wrapper für senden_alle()."""
+        if not ergebnisse:
+            return 0
+        return ausfuehren(self.senden_alle(ergebnisse))
 
     def zusammenfassung_sync(self, statistik: dict, top_listings: list[dict]):
         """Synchroner Wrapper für tages_zusammenfassung()."""
-        try:
-            asyncio.run(self.tages_zusammenfassung(statistik, top_listings))
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            loop.run_until_complete(
-                self.tages_zusammenfassung(statistik, top_listings)
-            )
-            loop.close()
+        ausfuehren(self.tages_zusammenfassung(statistik, top_listings))
+
+    def fehler_melden_sync(self, nachricht: str):
+        """Synchroner Wrapper für fehler_melden()."""
+        ausfuehren(self.fehler_melden(nachricht))
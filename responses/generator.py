@@ -1,5 +1,7 @@
 """Antwort-Generator: Erstellt passende Erstnachrichten nach SE Handwerk Tonalität."""
 
+import re
+
 from models import Kategorie, Bewertungsergebnis
 from utils.logger import setup_logger
 
@@ -122,6 +124,29 @@ TEMPLATES = {
 }
 
 
+def _muster(*woerter: str) -> re.Pattern:
+    return re.compile("|".join(map(re.escape, woerter)), re.IGNORECASE)
+
+
+# Sub-Template je Kategorie: erstes passendes Muster gewinnt
+SUB_TEMPLATE_MUSTER = {
+    Kategorie.BODEN: (
+        ("entfernung", _muster("entfernen", "abreißen", "rausreißen", "alten boden")),
+        ("sockelleisten", _muster("sockelleist", "fußleist")),
+    ),
+    Kategorie.MONTAGE: (
+        ("ikea", _muster("ikea", "pax", "kallax", "malm", "besta")),
+        ("fitness", _muster(
+            "fitness", "homegym", "power rack", "squat", "hantel",
+            "kraftstation", "laufband", "gym", "trainingsgerät",
+        )),
+    ),
+    Kategorie.UEBERGABE: (
+        ("vermieter", _muster("vermieter", "mieter", "mietwohnung", "vermietung")),
+    ),
+}
+
+
 class ResponseGenerator:
     """Generiert passende Antwort-Texte basierend auf Listing-Kategorie."""
 
@@ -132,7 +157,7 @@ class ResponseGenerator:
         """Generiert den besten Antwortvorschlag für ein Bewertungsergebnis."""
         kategorie = ergebnis.kategorie
         listing = ergebnis.listing
-        text = f"{listing.titel} {listing.beschreibung}".lower()
+        text = f"{listing.titel} {listing.beschreibung}"
 
         # Kategorie-spezifische Template-Auswahl
         templates = TEMPLATES.get(kategorie, TEMPLATES[Kategorie.SONSTIGES])
@@ -149,24 +174,7 @@ class ResponseGenerator:
 
     def _waehle_sub_template(self, text: str, kategorie: Kategorie) -> str:
         """Wählt das passendste Sub-Template basierend auf Text-Analyse."""
-
-        if kategorie == Kategorie.BODEN:
-            if any(kw in text for kw in ["entfernen", "abreißen", "rausreißen", "alten boden"]):
-                return "entfernung"
-            if any(kw in text for kw in ["sockelleist", "fußleist"]):
-                return "sockelleisten"
-
-        elif kategorie == Kategorie.MONTAGE:
-            if any(kw in text for kw in ["ikea", "pax", "kallax", "malm", "besta"]):
-                return "ikea"
-            if any(kw in text for kw in [
-                "fitness", "homegym", "power rack", "squat", "hantel",
-                "kraftstation", "laufband", "gym", "trainingsgerät",
-            ]):
-                return "fitness"
-
-        elif kategorie == Kategorie.UEBERGABE:
-            if any(kw in text for kw in ["vermieter", "mieter", "mietwohnung", "vermietung"]):
-                return "vermieter"
-
+        for key, muster in SUB_TEMPLATE_MUSTER.get(kategorie, ()):
+            if muster.search(text):
+                return key
         return "standard"
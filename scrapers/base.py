@@ -1,16 +1,75 @@
 """Abstrakte Basis-Klasse für alle Scraper."""
 
+import codecs
 import random
+import re
 import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 
 import requests
 from fake_useragent import UserAgent
+from lxml import etree, html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 
 from models import Listing
 from utils.logger import setup_logger
 
+# Anzahl vorab gezogener User-Agent-Strings pro Scraper
+UA_POOL_GROESSE = 64
+
+# <meta charset="…"> und <meta http-equiv="Content-Type" content="…; charset=…">
+_RE_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+
+def _html_encoding(response: requests.Response, body: bytes) -> str:
+    """Charset aus dem Header, sonst aus <meta> im Seitenanfang, sonst UTF-8."""
+    if "charset=" in response.headers.get("Content-Type", "").lower() and response.encoding:
+        return response.encoding
+    treffer = _RE_META_CHARSET.search(body[:64 * 1024])
+    if treffer:
+        try:
+            # Normalisierter Name – libxml2 kennt z. B. "iso8859-1", aber nicht "latin-1"
+            return codecs.lookup(treffer.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+def html_parsen(response: requests.Response):
+    """Parst den Body direkt als Bytes mit lxml; gibt das Root-Element zurück oder None.
+
+    Ohne Umweg über response.text (kompletter Python-Decode + Kopie). Kodierung siehe
+    _html_encoding – libxml2 würde ohne Angabe Latin-1 annehmen.
+    """
+    body = response.content
+    parser = lxml_html.HTMLParser(encoding=_html_encoding(response, body))
+    try:
+        return lxml_html.fromstring(body, parser=parser)
+    except (etree.ParserError, ValueError, LookupError):
+        return None
+
+
+def erstes_element(elem, selector):
+    """Erstes Treffer-Element eines vorkompilierten CSSSelector (wie BS4 select_one) oder None."""
+    treffer = selector(elem)
+    return treffer[0] if treffer else None
+
+
+def elem_text(elem) -> str:
+    """Text eines lxml-Elements mit normalisiertem Whitespace ("" wenn None)."""
+    return " ".join(elem.text_content().split()) if elem is not None else ""
+
+
+def _wartezeit_429(response: requests.Response, attempt: int) -> int:
+    """Wartezeit nach HTTP 429: Retry-After (Sekunden, max. 60), sonst 5 s je Versuch bis 30 s."""
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(int(retry_after), 60)
+    return min(30, 5 * attempt)
+
 
 class BaseScraper(ABC):
     """Basis-Scraper mit Rate-Limiting, User-Agent Rotation und Retry-Logik."""
@@ -18,10 +77,33 @@ class BaseScraper(ABC):
     def __init__(self, config: dict):
         self.config = config
         self.scraper_config = config.get("scraper", {})
+        # BS4-Parser: "lxml" (C, schnell) oder "html.parser" (reines Python, ohne Extra-Abhängigkeit)
+        self.html_parser = self.scraper_config.get("html_parser", "lxml")
         self.logger = setup_logger(f"se_handwerk.{self.name}")
         self.session = requests.Session()
-        self._ua = UserAgent()
+        # Keep-Alive-Pool; Verbindungsaufbau-Fehler wiederholt urllib3 sofort,
+        # HTTP-Status-Retries (429/5xx) bleiben in _request mit Wartezeiten.
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, read=0, backoff_factor=0.5),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # UserAgent.random ist teuer – einmal einen Pool ziehen, pro Request nur auswählen
+        ua = UserAgent()
+        self._ua_pool = tuple(ua.random for _ in range(UA_POOL_GROESSE))
+        self.session.headers.update({
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "de-DE,de;q=0.9,en;q=0.5",
+            # Nur was urllib3 dekodieren kann – "br" nur mit installiertem brotli
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+            "DNT": "1",
+        })
         self._update_headers()
+        # Frühester Zeitpunkt (time.monotonic) für den nächsten Request an diese Plattform
+        self._naechste_anfrage_ab = 0.0
 
     @property
     @abstractmethod
@@ -30,20 +112,16 @@ class BaseScraper(ABC):
         ...
 
     @abstractmethod
-    def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
-        """Führt eine Suche durch und gibt Listings zurück."""
+    def suchen(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
+        """Führt eine Suche durch und gibt höchstens `limit` Listings zurück.
+
+        Implementierungen brechen Paginierung und Parsing ab, sobald das Limit erreicht ist.
+        """
         ...
 
     def _update_headers(self):
-        """Setzt zufälligen User-Agent und Standard-Headers."""
-        self.session.headers.update({
-            "User-Agent": self._ua.random,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Accept-Language": "de-DE,de;q=0.9,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-            "DNT": "1",
-        })
+        """Rotiert den User-Agent; die übrigen Header setzt __init__ einmalig."""
+        self.session.headers["User-Agent"] = random.choice(self._ua_pool)
 
     def _request(self, url: str, params: Optional[dict] = None) -> Optional[requests.Response]:
         """HTTP-Request mit Retry-Logik und Rate-Limiting."""
@@ -53,70 +131,77 @@ class BaseScraper(ABC):
 
         for attempt in range(1, max_retries + 1):
             try:
-                # Rate-Limiting: zufällige Pause
-                delay = random.uniform(delay_range[0], delay_range[1])
-                time.sleep(delay)
+                # Rate-Limiting: nur die Restzeit seit dem letzten Request warten
+                rest = self._naechste_anfrage_ab - time.monotonic()
+                if rest > 0:
+                    time.sleep(rest)
 
                 # User-Agent bei jedem Request rotieren
                 self._update_headers()
 
-                self.logger.debug(f"Request #{attempt}: {url}")
-                response = self.session.get(url, params=params, timeout=timeout)
+                self.logger.debug("Request #%d: %s", attempt, url)
+                try:
+                    response = self.session.get(url, params=params, timeout=timeout)
+                finally:
+                    self._naechste_anfrage_ab = time.monotonic() + random.uniform(*delay_range)
 
                 if response.status_code == 200:
                     return response
 
                 if response.status_code == 429:
-                    wait = min(30, 5 * attempt)
-                    self.logger.warning(f"Rate-Limit (429) - warte {wait}s")
-                    time.sleep(wait)
+                    wait = _wartezeit_429(response, attempt)
+                    self.logger.warning("Rate-Limit (429) - warte %ds", wait)
+                    self._naechste_anfrage_ab = time.monotonic() + wait
                     continue
 
                 if response.status_code == 403:
-                    self.logger.warning(f"Zugriff verweigert (403) für {url}")
+                    self.logger.warning("Zugriff verweigert (403) für %s", url)
                     return None
 
                 self.logger.warning(
-                    f"HTTP {response.status_code} für {url} (Versuch {attempt}/{max_retries})"
+                    "HTTP %d für %s (Versuch %d/%d)",
+                    response.status_code, url, attempt, max_retries,
                 )
 
             except requests.exceptions.Timeout:
-                self.logger.warning(f"Timeout für {url} (Versuch {attempt}/{max_retries})")
+                self.logger.warning("Timeout für %s (Versuch %d/%d)", url, attempt, max_retries)
             except requests.exceptions.ConnectionError:
-                self.logger.warning(f"Verbindungsfehler für {url} (Versuch {attempt}/{max_retries})")
+                self.logger.warning("Verbindungsfehler für %s (Versuch %d/%d)", url, attempt, max_retries)
             except requests.exceptions.RequestException as e:
-                self.logger.error(f"Request-Fehler: {e}")
+                self.logger.error("Request-Fehler: %s", e)
                 return None
 
-        self.logger.error(f"Alle {max_retries} Versuche fehlgeschlagen für {url}")
+        self.logger.error("Alle %d Versuche fehlgeschlagen für %s", max_retries, url)
         return None
 
-    def alle_suchen(self, suchbegriffe: list[str], regionen: list[str]) -> list[Listing]:
-        """Durchsucht alle Kombinationen aus Suchbegriffen und Regionen."""
-        alle_listings = []
+    def alle_suchen(self, suchbegriffe: list[str], regionen: list[str]) -> Iterator[Listing]:
+        """Durchsucht alle Kombinationen aus Suchbegriffen und Regionen.
+
+        Generator: Listings werden direkt nach jeder Suche geliefert, damit die
+        Bewertung nicht auf die letzte Seite warten muss.
+        """
         max_pro_suche = self.scraper_config.get("max_ergebnisse_pro_suche", 20)
+        gesehen = set()
+        gesamt = 0
 
         for begriff in suchbegriffe:
             for region in regionen:
-                self.logger.info(f"Suche: '{begriff}' in '{region}'")
+                self.logger.info("Suche: '%s' in '%s'", begriff, region)
                 try:
-                    listings = self.suchen(begriff, region)
-                    listings = listings[:max_pro_suche]
-                    alle_listings.extend(listings)
-                    self.logger.info(f"  → {len(listings)} Ergebnisse")
+                    listings = self.suchen(begriff, region, max_pro_suche)
                 except Exception as e:
-                    self.logger.error(f"Fehler bei Suche '{begriff}' / '{region}': {e}")
+                    self.logger.error("Fehler bei Suche '%s' / '%s': %s", begriff, region, e)
+                    continue
+                self.logger.info("  → %d Ergebnisse", len(listings))
+                gesamt += len(listings)
 
-        # Deduplizierung innerhalb dieser Suche (nach URL)
-        gesehen = set()
-        unique = []
-        for listing in alle_listings:
-            if listing.url_hash not in gesehen:
-                gesehen.add(listing.url_hash)
-                unique.append(listing)
+                # Deduplizierung innerhalb dieser Suche (nach URL)
+                for listing in listings:
+                    if listing.url_hash not in gesehen:
+                        gesehen.add(listing.url_hash)
+                        yield listing
 
         self.logger.info(
-            f"{self.name}: {len(unique)} eindeutige Ergebnisse "
-            f"(von {len(alle_listings)} gesamt)"
+            "%s: %d eindeutige Ergebnisse (von %d gesamt)",
+            self.name, len(gesehen), gesamt,
         )
-        return unique
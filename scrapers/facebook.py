@@ -6,11 +6,71 @@ Facebook ist standardmäßig deaktiviert (config: facebook.enabled = false).
 """
 
 import os
+import re
 from datetime import datetime
 from typing import Optional
 
 from models import Listing, Quelle
 from scrapers.base import BaseScraper
+from utils.async_loop import ausfuehren
+
+# Allgemeine Gesuch-Marker (Wortanfänge), unabhängig von den konfigurierten Leistungen
+GESUCH_MARKER = ("such", "gesucht", "brauch", "benötig", "wer kann", "hilfe", "handwerk")
+
+
+def _relevanz_regex(config: dict) -> re.Pattern:
+    """Vorfilter aus den konfigurierten Suchbegriffen plus GESUCH_MARKER.
+
+    Nur ein billiger Ausschluss offensichtlicher Fremd-Posts (Werbung, Vorschläge);
+    die eigentliche Relevanz bewertet der Scorer. Nur Wortanfänge werden verglichen,
+    damit Flexionen und Komposita passen (renovier → Renovierung, laminat → Laminatboden).
+    """
+    woerter = {
+        wort
+        for begriffe in config.get("suchbegriffe", {}).values()
+        for begriff in begriffe
+        for wort in re.findall(r"\w{4,}", begriff.lower())
+    }
+    woerter.update(GESUCH_MARKER)
+    muster = "|".join(re.escape(w) for w in sorted(woerter))
+    return re.compile(rf"\b(?:{muster})", re.IGNORECASE)
+
+
+# Liest Text und Post-Link der ersten 10 Posts (max. 10 pro Gruppe) direkt im Browser aus
+POSTS_AUSLESEN_JS = """
+() => Array.from(
+    document.querySelectorAll("[role='article'], .x1yztbdb, [data-ad-comet-preview='message']")
+).slice(0, 10).map(e => {
+    const link = e.querySelector("a[href*='/posts/'], a[href*='/permalink/']");
+    return {text: e.innerText, href: link ? link.getAttribute("href") : null};
+})
+"""
+
+
+def _post_zu_listing(
+    text_content: str,
+    href: Optional[str],
+    gruppen_url: str,
+    region: str,
+    jetzt: datetime,
+) -> Listing:
+    """Baut ein Listing aus bereits ausgelesenem Post-Text und Link (ohne Playwright)."""
+    # Titel: Erste Zeile oder erste 100 Zeichen
+    lines = text_content.strip().split("\n")
+    titel = lines[0][:100] if lines else text_content[:100]
+
+    url = href or gruppen_url
+    if not url.startswith("http"):
+        url = f"https://www.facebook.com{url}"
+
+    return Listing(
+        url=url,
+        titel=titel,
+        beschreibung=text_content[:500],
+        ort=region,
+        quelle=Quelle.FACEBOOK,
+        datum_gefunden=jetzt,
+    )
 
 
 class FacebookScraper(BaseScraper):
@@ -24,6 +84,9 @@ class FacebookScraper(BaseScraper):
         super().__init__(config)
         self.session_cookie = os.getenv("FACEBOOK_SESSION_COOKIE", "")
         self.gruppen_urls = config.get("facebook", {}).get("gruppen_urls", [])
+        self._relevanz_re = _relevanz_regex(config)
+        # Leben auf dem gemeinsamen Loop (utils.async_loop) bis close()
+        self._pw = None
         self._browser = None
         self._page = None
 
@@ -35,8 +98,8 @@ class FacebookScraper(BaseScraper):
         try:
             from playwright.async_api import async_playwright
 
-            pw = await async_playwright().start()
-            self._browser = await pw.chromium.launch(headless=True)
+            self._pw = await async_playwright().start()
+            self._browser = await self._pw.chromium.launch(headless=True)
             context = await self._browser.new_context(
                 locale="de-DE",
                 user_agent=self.session.headers.get("User-Agent", ""),
@@ -62,9 +125,9 @@ class FacebookScraper(BaseScraper):
                 "Bitte installieren: pip install playwright && playwright install chromium"
             )
         except Exception as e:
-            self.logger.error(f"Browser-Init fehlgeschlagen: {e}")
+            self.logger.error("Browser-Init fehlgeschlagen: %s", e)
 
-    def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
+    def suchen(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
         """Synchroner Wrapper für die Facebook-Suche."""
         if not self.gruppen_urls:
             self.logger.warning("Keine Facebook-Gruppen konfiguriert")
@@ -77,17 +140,10 @@ class FacebookScraper(BaseScraper):
             )
             return []
 
-        import asyncio
+        # Gemeinsamer Loop: Browser und Seite bleiben über alle Suchen hinweg nutzbar
+        return ausfuehren(self._suchen_async(suchbegriff, region, limit))
 
-        try:
-            return asyncio.run(self._suchen_async(suchbegriff, region))
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            result = loop.run_until_complete(self._suchen_async(suchbegriff, region))
-            loop.close()
-            return result
-
-    async def _suchen_async(self, suchbegriff: str, region: str) -> list[Listing]:
+    async def _suchen_async(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
         """Durchsucht Facebook-Gruppen asynchron."""
         await self._init_browser()
 
@@ -97,13 +153,16 @@ class FacebookScraper(BaseScraper):
         alle_listings = []
 
         for gruppen_url in self.gruppen_urls:
-            self.logger.info(f"Durchsuche Facebook-Gruppe: {gruppen_url}")
+            # Limit erreicht: weitere Gruppen gar nicht erst öffnen
+            if len(alle_listings) >= limit:
+                break
+            self.logger.info("Durchsuche Facebook-Gruppe: %s", gruppen_url)
             listings = await self._gruppe_durchsuchen(
                 gruppen_url, suchbegriff, region
             )
             alle_listings.extend(listings)
 
-        return alle_listings
+        return alle_listings[:limit]
 
     async def _gruppe_durchsuchen(
         self, gruppen_url: str, suchbegriff: str, region: str
@@ -119,59 +178,31 @@ class FacebookScraper(BaseScraper):
             # Warten auf Ergebnisse
             await self._page.wait_for_timeout(3000)
 
-            # Posts sammeln
-            posts = await self._page.query_selector_all(
-                "[role='article'], .x1yztbdb, [data-ad-comet-preview='message']"
-            )
+            # Text und Link der ersten 10 Posts in einem einzigen evaluate()-Aufruf
+            posts = await self._page.evaluate(POSTS_AUSLESEN_JS)
+            jetzt = datetime.now()
 
-            for post in posts[:10]:  # Max 10 Posts pro Gruppe
-                listing = await self._parse_post(post, gruppen_url, region)
-                if listing:
-                    listings.append(listing)
+            for post in posts:
+                text_content = post.get("text") or ""
+                if len(text_content) < 20 or not self._relevanz_re.search(text_content):
+                    continue
+                listings.append(
+                    _post_zu_listing(
+                        text_content, post.get("href"), gruppen_url, region, jetzt
+                    )
+                )
 
         except Exception as e:
-            self.logger.error(f"Fehler bei Gruppe {gruppen_url}: {e}")
+            self.logger.error("Fehler bei Gruppe %s: %s", gruppen_url, e)
 
         return listings
 
-    async def _parse_post(
-        self, post_element, gruppen_url: str, region: str
-    ) -> Optional[Listing]:
-        """Parst einen Facebook-Post zu einem Listing."""
-        try:
-            # Text extrahieren
-            text_content = await post_element.inner_text()
-            if not text_content or len(text_content) < 20:
-                return None
-
-            # Titel: Erste Zeile oder erste 100 Zeichen
-            lines = text_content.strip().split("\n")
-            titel = lines[0][:100] if lines else text_content[:100]
-
-            # Link zum Post
-            link_elem = await post_element.query_selector("a[href*='/posts/'], a[href*='/permalink/']")
-            url = gruppen_url
-            if link_elem:
-                url = await link_elem.get_attribute("href") or gruppen_url
-                if not url.startswith("http"):
-                    url = f"https://www.facebook.com{url}"
-
-            return Listing(
-                url=url,
-                titel=titel,
-                beschreibung=text_content[:500],
-                ort=region,
-                quelle=Quelle.FACEBOOK,
-                datum_gefunden=datetime.now(),
-            )
-
-        except Exception as e:
-            self.logger.debug(f"Fehler beim Parsen eines Facebook-Posts: {e}")
-            return None
-
     async def close(self):
-        """Schließt den Browser."""
+        """Schließt Browser und Playwright-Treiber."""
         if self._browser:
             await self._browser.close()
             self._browser = None
             self._page = None
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
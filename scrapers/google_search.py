@@ -1,7 +1,16 @@
 """Google-Suche nach lokalen Handwerks-Gesuchen."""
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import islice
 from typing import Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
 
 from models import Listing, Quelle
 from scrapers.base import BaseScraper
@@ -11,15 +20,36 @@ try:
 except ImportError:
     google_search = None
 
+# Irrelevante Hosts: Domains inkl. Subdomains (de.wikipedia.org, m.youtube.com) …
+SKIP_DOMAINS = frozenset({"youtube.com", "wikipedia.org"})
+# … und Marken unabhängig von der TLD (amazon.de, www.ebay.com, pinterest.co.uk)
+SKIP_MARKEN = frozenset({"amazon", "ebay", "pinterest", "instagram"})
+
+# Für Titel und Beschreibung reichen diese Tags – Skripte, Styles, SVGs usw.
+# landen gar nicht erst im Baum
+SEITEN_STRAINER = SoupStrainer(["title", "meta", "p", "div"])
+
+# Max. Einträge im Seiten-Cache (LRU)
+CACHE_MAX = 2_000
+
 
 class GoogleScraper(BaseScraper):
     """Durchsucht Google nach lokalen Handwerker-Gesuchen."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        # Google liefert dieselben URLs über viele Durchläufe hinweg – Titel und
+        # Beschreibung pro URL merken statt die Seite erneut zu laden.
+        # Schlüssel: URL, Wert: (titel, beschreibung, time.monotonic() beim Abruf)
+        self._seiten_cache: OrderedDict[str, tuple] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_ttl = config.get("google", {}).get("cache_stunden", 6) * 3600
+
     @property
     def name(self) -> str:
         return "google"
 
-    def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
+    def suchen(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
         """Sucht auf Google nach Gesuchen."""
         if google_search is None:
             self.logger.error(
@@ -32,8 +62,6 @@ class GoogleScraper(BaseScraper):
         max_results = google_config.get("max_results", 10)
         site_filter = google_config.get("site_filter", [])
 
-        listings = []
-
         # Suche mit Site-Filter
         if site_filter:
             site_query = " OR ".join(f"site:{s}" for s in site_filter)
@@ -41,56 +69,131 @@ class GoogleScraper(BaseScraper):
         else:
             query = f'"{suchbegriff}" {region} gesucht'
 
-        self.logger.debug(f"Google-Query: {query}")
-
-        try:
-            results = google_search(
-                query,
-                num_results=max_results,
-                lang="de",
-                region="de",
-            )
+        self.logger.debug("Google-Query: %s", query)
+
+        parallel = google_config.get("parallele_abrufe", 4)
+        # Ein Zeitstempel für alle Listings dieser Suche
+        jetzt = datetime.now()
+        futures = []
+
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            try:
+                results = google_search(
+                    query,
+                    num_results=min(max_results, limit),
+                    lang="de",
+                    region="de",
+                )
+
+                # URLs laufen direkt aus dem Generator in den Pool: irrelevante Hosts
+                # werden vor dem Abruf verworfen, die übrigen Seiten parallel geladen,
+                # während Google noch weitere Ergebnisseiten liefert.
+                relevante = (url for url in results if not self._ueberspringen(url))
+                for url in islice(relevante, limit):
+                    futures.append(
+                        executor.submit(
+                            self._url_zu_listing, url, suchbegriff, region, jetzt
+                        )
+                    )
+
+            except Exception as e:
+                self.logger.error("Google-Suche fehlgeschlagen: %s", e)
 
-            for url in results:
-                listing = self._url_zu_listing(url, suchbegriff, region)
-                if listing:
-                    listings.append(listing)
+        listings = []
+        for future in futures:
+            try:
+                listings.append(future.result())
+            except Exception as e:
+                self.logger.debug("Google-Ergebnis nicht verarbeitet: %s", e)
+        return listings
 
-        except Exception as e:
-            self.logger.error(f"Google-Suche fehlgeschlagen: {e}")
+    @staticmethod
+    def _ueberspringen(url: str) -> bool:
+        """Bekannte irrelevante URLs – reine Prüfung des Hostnamens, ohne Abruf."""
+        labels = (urlsplit(url).hostname or "").split(".")
+        return (
+            ".".join(labels[-2:]) in SKIP_DOMAINS
+            or not SKIP_MARKEN.isdisjoint(labels[:-1])
+        )
 
-        return listings
+    def _seite_abrufen(self, url: str) -> Optional[tuple[bytes, Optional[str]]]:
+        """Lädt höchstens google.max_html_bytes einer Ergebnisseite.
+
+        Jede URL liegt auf einem anderen Host – daher ohne das Plattform-Pacing
+        und die Retries von _request, damit die Abrufe parallel laufen können.
+        Titel und Beschreibung stehen am Seitenanfang; der Rest wird nicht geladen.
+        Gibt (Bytes, Charset aus dem Header oder None) zurück.
+        """
+        timeout = self.scraper_config.get("timeout_sekunden", 30)
+        max_bytes = self.config.get("google", {}).get("max_html_bytes", 512 * 1024)
+        inhalt = bytearray()
+        try:
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                if response.status_code != 200:
+                    return None
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    inhalt += chunk
+                    if len(inhalt) >= max_bytes:
+                        break
+        except requests.exceptions.RequestException as e:
+            self.logger.debug("Abruf fehlgeschlagen %s: %s", url, e)
+            return None
+        # Ohne charset im Header erkennt BS4 die Kodierung selbst (meta charset)
+        charset = "charset=" in response.headers.get("Content-Type", "").lower()
+        return bytes(inhalt[:max_bytes]), response.encoding if charset else None
 
     def _url_zu_listing(
-        self, url: str, suchbegriff: str, region: str
-    ) -> Optional[Listing]:
+        self, url: str, suchbegriff: str, region: str, jetzt: datetime
+    ) -> Listing:
         """Erstellt ein Listing aus einer Google-Ergebnis-URL."""
-        # Bekannte irrelevante URLs filtern
-        skip_domains = [
-            "youtube.com", "wikipedia.org", "amazon.",
-            "ebay.", "pinterest.", "instagram.",
-        ]
-        if any(domain in url.lower() for domain in skip_domains):
-            return None
+        with self._cache_lock:
+            eintrag = self._seiten_cache.get(url)
+            if eintrag and time.monotonic() - eintrag[2] < self._cache_ttl:
+                self._seiten_cache.move_to_end(url)
+                titel, beschreibung = eintrag[0], eintrag[1]
+            else:
+                eintrag = None
+
+        if eintrag is None:
+            # Seite abrufen und Titel extrahieren
+            seite = self._seite_abrufen(url)
+            if seite is None:
+                # Fehlschläge nicht cachen – beim nächsten Durchlauf erneut versuchen
+                return Listing(
+                    url=url,
+                    titel=f"{suchbegriff} in {region}",
+                    beschreibung="",
+                    ort=region,
+                    quelle=Quelle.GOOGLE,
+                    datum_gefunden=jetzt,
+                )
+            titel, beschreibung = self._titel_beschreibung(seite)
+            with self._cache_lock:
+                self._seiten_cache[url] = (titel, beschreibung, time.monotonic())
+                self._seiten_cache.move_to_end(url)
+                if len(self._seiten_cache) > CACHE_MAX:
+                    self._seiten_cache.popitem(last=False)
 
-        # Seite abrufen und Titel extrahieren
-        response = self._request(url)
-        if not response:
-            return Listing(
-                url=url,
-                titel=f"{suchbegriff} in {region}",
-                beschreibung="",
-                ort=region,
-                quelle=Quelle.GOOGLE,
-                datum_gefunden=datetime.now(),
-            )
+        return Listing(
+            url=url,
+            titel=titel or suchbegriff,
+            beschreibung=beschreibung,
+            ort=region,
+            quelle=Quelle.GOOGLE,
+            datum_gefunden=jetzt,
+        )
 
+    def _titel_beschreibung(
+        self, seite: tuple[bytes, Optional[str]]
+    ) -> tuple[Optional[str], str]:
+        """Titel (None ohne <title>) und Beschreibung aus dem geladenen Seitenanfang."""
         # Titel aus HTML extrahieren
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(response.text, "html.parser")
+        inhalt, encoding = seite
+        soup = BeautifulSoup(
+            inhalt, self.html_parser, parse_only=SEITEN_STRAINER, from_encoding=encoding
+        )
 
-        titel = suchbegriff
+        titel = None
         title_tag = soup.find("title")
         if title_tag:
             titel = title_tag.get_text(strip=True)[:200]
@@ -108,11 +211,4 @@ class GoogleScraper(BaseScraper):
                     beschreibung = text[:500]
                     break
 
-        return Listing(
-            url=url,
-            titel=titel,
-            beschreibung=beschreibung,
-            ort=region,
-            quelle=Quelle.GOOGLE,
-            datum_gefunden=datetime.now(),
-        )
+        return titel, beschreibung
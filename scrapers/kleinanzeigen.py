@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
 from models import Listing, Quelle
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, elem_text, erstes_element, html_parsen
 
 
 # PLZ-Codes für Regionen (Kleinanzeigen nutzt PLZ + Radius)
@@ -19,116 +19,102 @@ REGION_PLZ = {
     "Sachsenheim": "74343",
 }
 
+# Selektoren einmalig beim Import nach XPath kompilieren (nicht pro Listing)
+SEL_ARTIKEL = CSSSelector("article.aditem")
+SEL_ARTIKEL_ALT = CSSSelector("li.ad-listitem article")
+SEL_TITEL = CSSSelector("a.ellipsis, h2.text-module-begin a, [data-testid='ad-title']")
+SEL_BESCHREIBUNG = CSSSelector(
+    "p.aditem-main--middle--description, [data-testid='ad-description']"
+)
+SEL_ORT = CSSSelector(".aditem-main--top--left, [data-testid='ad-location']")
+SEL_PREIS = CSSSelector(
+    ".aditem-main--middle--price-shipping--price, [data-testid='ad-price']"
+)
+SEL_DATUM = CSSSelector(".aditem-main--top--right, [data-testid='ad-date']")
+
 
 class KleinanzeigenScraper(BaseScraper):
     """Durchsucht Kleinanzeigen.de nach Handwerks-Gesuchen."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        # Config ist pro Prozess fest – einmal lesen statt pro Suche/Listing
+        kleinanzeigen_config = config.get("kleinanzeigen", {})
+        self._basis_url = kleinanzeigen_config.get(
+            "basis_url", "https://www.kleinanzeigen.de"
+        ).rstrip("/")
+        # Radius: suchgebiet (100 km) oder kleinanzeigen.radius_km
+        self._radius_km = (
+            config.get("suchgebiet", {}).get("radius_km")
+            or kleinanzeigen_config.get("radius_km", 100)
+        )
+
     @property
     def name(self) -> str:
         return "kleinanzeigen"
 
     def _build_url(self, suchbegriff: str, plz: str, radius_km: int = 50) -> str:
         """Baut die Such-URL für Kleinanzeigen."""
-        basis = self.config.get("kleinanzeigen", {}).get(
-            "basis_url", "https://www.kleinanzeigen.de"
-        )
         encoded = quote_plus(suchbegriff)
-        return f"{basis}/s-{plz}/anzeige:gesuche/{encoded}/k0r{radius_km}"
+        return f"{self._basis_url}/s-{plz}/anzeige:gesuche/{encoded}/k0r{radius_km}"
 
-    def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
+    def suchen(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
         """Sucht auf Kleinanzeigen nach Gesuchen (nur Heilbronn + Radius 100 km)."""
         plz = REGION_PLZ.get(region, "74072")
-        # Radius: suchgebiet (100 km) oder kleinanzeigen.radius_km
-        radius = (
-            self.config.get("suchgebiet", {}).get("radius_km")
-            or self.config.get("kleinanzeigen", {}).get("radius_km", 100)
-        )
-        url = self._build_url(suchbegriff, plz, radius)
+        url = self._build_url(suchbegriff, plz, self._radius_km)
 
         response = self._request(url)
         if not response:
             return []
 
-        return self._parse_ergebnisse(response.text, suchbegriff)
+        root = html_parsen(response)
+        if root is None:
+            return []
+
+        return self._parse_ergebnisse(root, suchbegriff, limit)
 
-    def _parse_ergebnisse(self, html: str, suchbegriff: str) -> list[Listing]:
-        """Parst die Suchergebnisse-Seite."""
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse_ergebnisse(self, root, suchbegriff: str, limit: int) -> list[Listing]:
+        """Parst die Suchergebnisse-Seite (lxml-Root)."""
         listings = []
 
-        # Kleinanzeigen Listing-Container
-        artikel_liste = soup.select("article.aditem")
-        if not artikel_liste:
-            # Alternativer Selektor
-            artikel_liste = soup.select("li.ad-listitem article")
+        # Kleinanzeigen Listing-Container, sonst alternativer Selektor
+        artikel_liste = SEL_ARTIKEL(root) or SEL_ARTIKEL_ALT(root)
+        # Ein Zeitstempel für alle Listings dieser Seite
+        jetzt = datetime.now()
 
         for artikel in artikel_liste:
-            listing = self._parse_einzelnes_listing(artikel)
+            listing = self._parse_einzelnes_listing(artikel, jetzt)
             if listing:
                 listings.append(listing)
+                if len(listings) >= limit:
+                    break
 
         self.logger.debug(
-            f"Kleinanzeigen: {len(listings)} Listings geparst für '{suchbegriff}'"
+            "Kleinanzeigen: %d Listings geparst für '%s'", len(listings), suchbegriff
         )
         return listings
 
-    def _parse_einzelnes_listing(self, artikel) -> Optional[Listing]:
+    def _parse_einzelnes_listing(self, artikel, jetzt: datetime) -> Optional[Listing]:
         """Parst ein einzelnes Listing aus dem HTML."""
         try:
             # Titel
-            titel_elem = artikel.select_one(
-                "a.ellipsis, h2.text-module-begin a, [data-testid='ad-title']"
-            )
-            if not titel_elem:
+            titel_elem = erstes_element(artikel, SEL_TITEL)
+            if titel_elem is None:
                 return None
-            titel = titel_elem.get_text(strip=True)
+            titel = elem_text(titel_elem)
 
             # URL
             link = titel_elem.get("href", "")
             if link and not link.startswith("http"):
-                basis = self.config.get("kleinanzeigen", {}).get(
-                    "basis_url", "https://www.kleinanzeigen.de"
-                )
-                link = f"{basis}{link}"
+                link = f"{self._basis_url}{link}"
 
             if not link:
                 return None
 
-            # Beschreibung
-            beschreibung_elem = artikel.select_one(
-                "p.aditem-main--middle--description, "
-                "[data-testid='ad-description']"
-            )
-            beschreibung = ""
-            if beschreibung_elem:
-                beschreibung = beschreibung_elem.get_text(strip=True)
-
-            # Ort
-            ort_elem = artikel.select_one(
-                ".aditem-main--top--left, "
-                "[data-testid='ad-location']"
-            )
-            ort = ""
-            if ort_elem:
-                ort = ort_elem.get_text(strip=True)
-
-            # Preis
-            preis_elem = artikel.select_one(
-                ".aditem-main--middle--price-shipping--price, "
-                "[data-testid='ad-price']"
-            )
-            preis = None
-            if preis_elem:
-                preis = preis_elem.get_text(strip=True)
-
-            # Datum
-            datum_elem = artikel.select_one(
-                ".aditem-main--top--right, "
-                "[data-testid='ad-date']"
-            )
-            datum_inserat = None
-            if datum_elem:
-                datum_inserat = datum_elem.get_text(strip=True)
+            beschreibung = elem_text(erstes_element(artikel, SEL_BESCHREIBUNG))
+            ort = elem_text(erstes_element(artikel, SEL_ORT))
+            preis = elem_text(erstes_element(artikel, SEL_PREIS)) or None
+            datum_inserat = elem_text(erstes_element(artikel, SEL_DATUM)) or None
 
             return Listing(
                 url=link,
@@ -136,11 +122,11 @@ class KleinanzeigenScraper(BaseScraper):
                 beschreibung=beschreibung,
                 ort=ort,
                 quelle=Quelle.KLEINANZEIGEN,
-                datum_gefunden=datetime.now(),
+                datum_gefunden=jetzt,
                 datum_inserat=datum_inserat,
                 preis=preis,
             )
 
         except Exception as e:
-            self.logger.debug(f"Fehler beim Parsen eines Listings: {e}")
+            self.logger.debug("Fehler beim Parsen eines Listings: %s", e)
             return None
@@ -4,10 +4,10 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bs4 import BeautifulSoup
+from lxml.cssselect import CSSSelector
 
 from models import Listing, Quelle
-from scrapers.base import BaseScraper
+from scrapers.base import BaseScraper, elem_text, erstes_element, html_parsen
 
 
 # MyHammer Kategorien-Mapping
@@ -26,19 +26,49 @@ REGION_SLUGS = {
     "Mannheim": "mannheim",
 }
 
+# Fallback-Kategorien je Suchbegriff: (Schlüsselwort-Stämme, Kategorien).
+# Teilstring-Treffer, damit "renovier" auch "Renovierung" findet.
+KATEGORIE_KEYWORDS = (
+    (("laminat", "vinyl", "boden", "belag", "teppich"), ("boden",)),
+    (("montage", "aufbau", "möbel", "ikea", "rack"), ("montage",)),
+    (("übergabe", "renovier", "auszug", "streichen"), ("uebergabe", "maler")),
+)
+
+# Selektoren einmalig beim Import nach XPath kompilieren (nicht pro Auftrag)
+SEL_AUFTRAG = CSSSelector(
+    ".job-card, .auction-item, .search-result-item, "
+    "[data-testid='job-card'], .job-list-item"
+)
+SEL_TITEL = CSSSelector(
+    "h2 a, h3 a, .job-title a, .auction-title a, [data-testid='job-title']"
+)
+SEL_BESCHREIBUNG = CSSSelector(
+    ".job-description, .auction-description, [data-testid='job-description'], p"
+)
+SEL_ORT = CSSSelector(
+    ".job-location, .auction-location, [data-testid='job-location'], .location"
+)
+SEL_PREIS = CSSSelector(
+    ".job-budget, .auction-budget, .price, [data-testid='job-budget']"
+)
+
 
 class MyHammerScraper(BaseScraper):
     """Durchsucht MyHammer.de nach Handwerks-Aufträgen."""
 
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self._basis_url = config.get("myhammer", {}).get(
+            "basis_url", "https://www.myhammer.de"
+        ).rstrip("/")
+
     @property
     def name(self) -> str:
         return "myhammer"
 
-    def suchen(self, suchbegriff: str, region: str) -> list[Listing]:
+    def suchen(self, suchbegriff: str, region: str, limit: int) -> list[Listing]:
         """Sucht auf MyHammer nach passenden Aufträgen."""
-        basis_url = self.config.get("myhammer", {}).get(
-            "basis_url", "https://www.myhammer.de"
-        )
+        basis_url = self._basis_url
 
         # Suchanfrage an MyHammer
         encoded = quote_plus(suchbegriff)
@@ -50,75 +80,77 @@ class MyHammerScraper(BaseScraper):
         response = self._request(url)
         if not response:
             # Fallback: Kategorie-basierte Suche
-            return self._suche_per_kategorie(basis_url, suchbegriff, region_slug)
+            return self._suche_per_kategorie(basis_url, suchbegriff, region_slug, limit)
 
-        return self._parse_ergebnisse(response.text, basis_url)
+        return self._parse_ergebnisse(html_parsen(response), basis_url, limit)
 
     def _suche_per_kategorie(
-        self, basis_url: str, suchbegriff: str, region_slug: str
+        self, basis_url: str, suchbegriff: str, region_slug: str, limit: int
     ) -> list[Listing]:
         """Fallback: Durchsucht MyHammer-Kategorien."""
         listings = []
 
         # Relevante Kategorien basierend auf Suchbegriff erkennen
         suchbegriff_lower = suchbegriff.lower()
-        relevante_kats = []
-
-        boden_keywords = ["laminat", "vinyl", "boden", "belag", "teppich"]
-        montage_keywords = ["montage", "aufbau", "möbel", "ikea", "rack"]
-        uebergabe_keywords = ["übergabe", "renovier", "auszug", "streichen"]
-
-        if any(kw in suchbegriff_lower for kw in boden_keywords):
-            relevante_kats.append("boden")
-        if any(kw in suchbegriff_lower for kw in montage_keywords):
-            relevante_kats.append("montage")
-        if any(kw in suchbegriff_lower for kw in uebergabe_keywords):
-            relevante_kats.extend(["uebergabe", "maler"])
+        # dict statt Liste: jede Kategorie-Seite höchstens einmal laden, Reihenfolge bleibt
+        relevante_kats = dict.fromkeys(
+            kat
+            for keywords, kats in KATEGORIE_KEYWORDS
+            if any(kw in suchbegriff_lower for kw in keywords)
+            for kat in kats
+        )
 
         if not relevante_kats:
-            relevante_kats = ["boden", "montage"]
+            relevante_kats = ("boden", "montage")
 
         for kat_key in relevante_kats:
+            # Limit erreicht: keine weiteren Kategorie-Seiten laden
+            if len(listings) >= limit:
+                break
             kat_slug = KATEGORIEN_URLS.get(kat_key, kat_key)
             url = f"{basis_url}/auftraege/{kat_slug}/{region_slug}"
 
             response = self._request(url)
             if response:
-                listings.extend(self._parse_ergebnisse(response.text, basis_url))
+                listings.extend(
+                    self._parse_ergebnisse(
+                        html_parsen(response), basis_url, limit - len(listings)
+                    )
+                )
 
         return listings
 
-    def _parse_ergebnisse(self, html: str, basis_url: str) -> list[Listing]:
-        """Parst MyHammer-Suchergebnisse."""
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse_ergebnisse(self, root, basis_url: str, limit: int) -> list[Listing]:
+        """Parst MyHammer-Suchergebnisse (lxml-Root, None = nicht parsbar)."""
+        if root is None:
+            return []
         listings = []
 
-        # MyHammer Auftrags-Cards
-        auftraege = soup.select(
-            ".job-card, .auction-item, .search-result-item, "
-            "[data-testid='job-card'], .job-list-item"
-        )
+        # Ein Zeitstempel für alle Aufträge dieser Seite
+        jetzt = datetime.now()
 
-        for auftrag in auftraege:
-            listing = self._parse_auftrag(auftrag, basis_url)
+        # MyHammer Auftrags-Cards
+        for auftrag in SEL_AUFTRAG(root):
+            listing = self._parse_auftrag(auftrag, basis_url, jetzt)
             if listing:
                 listings.append(listing)
+                if len(listings) >= limit:
+                    break
 
-        self.logger.debug(f"MyHammer: {len(listings)} Aufträge geparst")
+        self.logger.debug("MyHammer: %d Aufträge geparst", len(listings))
         return listings
 
-    def _parse_auftrag(self, element, basis_url: str) -> Optional[Listing]:
+    def _parse_auftrag(
+        self, element, basis_url: str, jetzt: datetime
+    ) -> Optional[Listing]:
         """Parst einen einzelnen MyHammer-Auftrag."""
         try:
             # Titel
-            titel_elem = element.select_one(
-                "h2 a, h3 a, .job-title a, .auction-title a, "
-                "[data-testid='job-title']"
-            )
-            if not titel_elem:
+            titel_elem = erstes_element(element, SEL_TITEL)
+            if titel_elem is None:
                 return None
 
-            titel = titel_elem.get_text(strip=True)
+            titel = elem_text(titel_elem)
             link = titel_elem.get("href", "")
             if link and not link.startswith("http"):
                 link = f"{basis_url}{link}"
@@ -126,32 +158,10 @@ class MyHammerScraper(BaseScraper):
             if not link:
                 return None
 
-            # Beschreibung
-            beschreibung = ""
-            desc_elem = element.select_one(
-                ".job-description, .auction-description, "
-                "[data-testid='job-description'], p"
-            )
-            if desc_elem:
-                beschreibung = desc_elem.get_text(strip=True)
-
-            # Ort
-            ort = ""
-            ort_elem = element.select_one(
-                ".job-location, .auction-location, "
-                "[data-testid='job-location'], .location"
-            )
-            if ort_elem:
-                ort = ort_elem.get_text(strip=True)
-
+            beschreibung = elem_text(erstes_element(element, SEL_BESCHREIBUNG))
+            ort = elem_text(erstes_element(element, SEL_ORT))
             # Budget / Preis
-            preis = None
-            preis_elem = element.select_one(
-                ".job-budget, .auction-budget, .price, "
-                "[data-testid='job-budget']"
-            )
-            if preis_elem:
-                preis = preis_elem.get_text(strip=True)
+            preis = elem_text(erstes_element(element, SEL_PREIS)) or None
 
             return Listing(
                 url=link,
@@ -159,10 +169,10 @@ class MyHammerScraper(BaseScraper):
                 beschreibung=beschreibung,
                 ort=ort,
                 quelle=Quelle.MYHAMMER,
-                datum_gefunden=datetime.now(),
+                datum_gefunden=jetzt,
                 preis=preis,
             )
 
         except Exception as e:
-            self.logger.debug(f"Fehler beim Parsen eines MyHammer-Auftrags: {e}")
+            self.logger.debug("Fehler beim Parsen eines MyHammer-Auftrags: %s", e)
             return None
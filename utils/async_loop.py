@@ -0,0 +1,29 @@
+"""Ein gemeinsamer Event-Loop in einem Hintergrund-Thread für alle async-Aufrufe."""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def _loop_holen() -> asyncio.AbstractEventLoop:
+    """Startet den Loop beim ersten Aufruf; danach läuft er bis Prozessende."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="async-loop", daemon=True
+            ).start()
+        return _loop
+
+
+def ausfuehren(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Führt eine Coroutine auf dem gemeinsamen Loop aus und wartet auf das Ergebnis.
+
+    Anders als asyncio.run() bleiben Loop und die HTTP-Verbindungen des
+    Telegram-Bots über Aufrufe hinweg erhalten (Keep-Alive).
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _loop_holen()).result()
@@ -2,60 +2,89 @@
 
 import re
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import lru_cache
+from typing import Callable, Optional
 
 from models import Listing
 
+_RE_VOR_STUNDEN = re.compile(r"vor\s+(\d+)\s*(?:std\.?|stunden?)", re.I)
+_RE_UHRZEIT = re.compile(r"(\d{1,2})\s*:\s*(\d{2})")
+_RE_DATUM = re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})")
 
-def parse_inserat_datum(text: Optional[str]) -> Optional[datetime]:
+
+@lru_cache(maxsize=4096)
+def _datumsangabe_zerlegen(text: str) -> Optional[tuple]:
+    """Regex-Teil von parse_inserat_datum: zeitunabhängig und daher cachebar.
+
+    Liefert ("stunden", h), ("heute"|"gestern", [h, mi]) oder ("datum", y, mo, d).
+    """
+    klein = text.lower()
+
+    # "Vor X Std." / "Vor X Stunden" – Regex nur, wenn "vor" überhaupt vorkommt
+    m = _RE_VOR_STUNDEN.search(text) if "vor" in klein else None
+    if m:
+        return ("stunden", int(m.group(1)))
+
+    # "Heute, 14:30" / "Gestern, 09:00" (auch ohne Uhrzeit)
+    for art in ("heute", "gestern"):
+        if art in klein:
+            m = _RE_UHRZEIT.search(text)
+            return (art, int(m.group(1)), int(m.group(2))) if m else (art,)
+
+    # "25.01.2025" oder "25.01.25" – ohne Punkt kein Datum
+    m = _RE_DATUM.search(text) if "." in text else None
+    if m:
+        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        if y < 100:
+            y += 2000
+        return ("datum", y, mo, d)
+
+    return None
+
+
+def parse_inserat_datum(
+    text: Optional[str], now: Optional[datetime] = None
+) -> Optional[datetime]:
     """
     Parst typische deutsche Datumsangaben von Kleinanzeigen.
     Beispiele: "Heute, 14:30", "Gestern, 09:00", "Vor 2 Std.", "25.01.2025"
+    now: Bezugszeitpunkt für relative Angaben (Standard: jetzt).
     Gibt None zurück, wenn nicht parsbar.
     """
     if not text or not isinstance(text, str):
         return None
-    text = text.strip()
-    now = datetime.now()
+    angabe = _datumsangabe_zerlegen(text.strip())
+    if angabe is None:
+        return None
 
-    # "Vor X Std." / "Vor X Stunden"
-    m = re.search(r"vor\s+(\d+)\s*(?:std\.?|stunden?)", text, re.I)
-    if m:
-        stunden = int(m.group(1))
-        return now - timedelta(hours=stunden)
-
-    # "Heute, 14:30" / "Heute 14:30"
-    if re.search(r"heute", text, re.I):
-        m = re.search(r"(\d{1,2})\s*:\s*(\d{2})", text)
-        if m:
-            h, mi = int(m.group(1)), int(m.group(2))
-            return now.replace(hour=h, minute=mi, second=0, microsecond=0)
+    # Relative Angaben immer gegen die aktuelle Zeit auflösen (nicht mitcachen)
+    art = angabe[0]
+    now = now or datetime.now()
+
+    if art == "stunden":
+        return now - timedelta(hours=angabe[1])
+
+    if art == "heute":
+        if len(angabe) == 3:
+            return now.replace(hour=angabe[1], minute=angabe[2], second=0, microsecond=0)
         return now  # "Heute" ohne Uhrzeit = jetzt
 
-    # "Gestern, 09:00"
-    if re.search(r"gestern", text, re.I):
-        m = re.search(r"(\d{1,2})\s*:\s*(\d{2})", text)
+    if art == "gestern":
         gestern = now - timedelta(days=1)
-        if m:
-            h, mi = int(m.group(1)), int(m.group(2))
-            return gestern.replace(hour=h, minute=mi, second=0, microsecond=0)
+        if len(angabe) == 3:
+            return gestern.replace(hour=angabe[1], minute=angabe[2], second=0, microsecond=0)
         return gestern.replace(hour=12, minute=0, second=0, microsecond=0)
 
-    # "25.01.2025" oder "25.01.25"
-    m = re.search(r"(\d{1,2})\.(\d{1,2})\.(\d{2,4})", text)
-    if m:
-        d, mo, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        if y < 100:
-            y += 2000
-        try:
-            return datetime(y, mo, d, 12, 0, 0)
-        except ValueError:
-            return None
-
-    return None
+    y, mo, d = angabe[1:]
+    try:
+        return datetime(y, mo, d, 12, 0, 0)
+    except ValueError:
+        return None
 
 
-def ist_nicht_aelter_als_stunden(listing: Listing, max_stunden: int) -> bool:
+def ist_nicht_aelter_als_stunden(
+    listing: Listing, max_stunden: int, now: Optional[datetime] = None
+) -> bool:
     """
     True, wenn die Anzeige nicht älter als max_stunden ist.
     Wenn datum_inserat nicht parsbar ist: Anzeige wird aus Sicherheit
@@ -63,8 +92,33 @@ def ist_nicht_aelter_als_stunden(listing: Listing, max_stunden: int) -> bool:
     """
     if max_stunden <= 0:
         return True
-    parsed = parse_inserat_datum(listing.datum_inserat)
+    now = now or datetime.now()
+    parsed = parse_inserat_datum(listing.datum_inserat, now)
     if parsed is None:
         return False
-    grenze = datetime.now() - timedelta(hours=max_stunden)
-    return parsed >= grenze
+    return parsed >= now - timedelta(hours=max_stunden)
+
+
+def alter_pruefer(
+    max_stunden: int, now: Optional[datetime] = None
+) -> Callable[[Listing], bool]:
+    """Prädikat "nicht älter als max_stunden" mit einem festen Zeitpunkt für viele Listings."""
+    if max_stunden <= 0:
+        return lambda listing: True
+    now = now or datetime.now()
+    grenze = now - timedelta(hours=max_stunden)
+
+    def pruefen(listing: Listing) -> bool:
+        text = listing.datum_inserat
+        angabe = _datumsangabe_zerlegen(text.strip()) if text and isinstance(text, str) else None
+        if angabe is None:
+            return False
+        # "Vor N Std." / "Heute" ohne Uhrzeit: direkt vergleichen, ohne datetime zu bauen
+        if angabe[0] == "stunden":
+            return angabe[1] <= max_stunden
+        if angabe == ("heute",):
+            return True
+        parsed = parse_inserat_datum(text, now)
+        return parsed is not None and parsed >= grenze
+
+    return pruefen
@@ -1,4 +1,5 @@
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -10,7 +11,12 @@ def setup_logger(name: str = "se_handwerk", log_file: str = "se_handwerk.log") -
     if logger.handlers:
         return logger
 
-    logger.setLevel(logging.DEBUG)
+    # Produktion: z.B. SE_HANDWERK_LOG_LEVEL=INFO – DEBUG-Aufrufe in den
+    # Parse-Schleifen werden dann verworfen, bevor ihre Nachricht formatiert wird
+    level_name = os.getenv("SE_HANDWERK_LOG_LEVEL", "DEBUG").upper()
+    level = logging.getLevelName(level_name)
+    # Unbekannte Namen liefern "Level X" statt int – dann DEBUG statt ValueError beim Start
+    logger.setLevel(level if isinstance(level, int) else logging.DEBUG)
 
     formatter = logging.Formatter(
         "%(asctime)s | %(name)-20s | %(levelname)-8s | %(message)s",
@@ -31,4 +37,7 @@ def setup_logger(name: str = "se_handwerk", log_file: str = "se_handwerk.log") -
     file_handler.setFormatter(formatter)
     logger.addHandler(file_handler)
 
+    if not isinstance(level, int):
+        logger.warning("Unbekanntes SE_HANDWERK_LOG_LEVEL '%s' – verwende DEBUG", level_name)
+
     return logger